@@ -0,0 +1,65 @@
+import threading
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted. status is the HTTP code to return."""
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+class AdmissionController:
+    """
+    Bounded concurrency for expensive requests.
+    Up to max_concurrent requests run at once; up to max_queue more wait
+    (at most queue_timeout seconds) for a free slot. Anything beyond the
+    queue is rejected immediately with 429, and queued requests that wait
+    too long get 503, so latency cannot grow without bound.
+    """
+    def __init__(self, max_concurrent=4, max_queue=8, queue_timeout=5.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Takes a slot or raises Overloaded."""
+        with self._cond:
+            if self.running < self.max_concurrent:
+                self.running += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded("Too many requests, try again later", 429)
+
+            self.waiting += 1
+            try:
+                free = self._cond.wait_for(lambda: self.running < self.max_concurrent, timeout=self.queue_timeout)
+            finally:
+                self.waiting -= 1
+            if not free:
+                self.timed_out += 1
+                raise Overloaded("Server busy, request timed out in queue", 503)
+            self.running += 1
+            self.admitted += 1
+
+    def release(self):
+        with self._cond:
+            self.running -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "running": self.running,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
@@ -1,6 +1,30 @@
 import math
+import random
 import string
+import time
 from knowledge_base import loader
+from metrics import STAGE_SECONDS, CANDIDATES_PRUNED
+
+# Segmentation: words up to MAX_WORD_LEN chars; words shorter than 3 chars
+# must be in this list to prevent garbage tiling ('a', 'i', 'is', 'to', ...)
+MAX_WORD_LEN = 20
+# Texts this long are segmented with StreamingSegmenter (bounded memory)
+STREAM_SEGMENT_MIN_LEN = 10000
+SAFE_SHORT_WORDS = {
+    'a','i',
+    'am','an','as','at','be','by','do','go','he','hi','if','in','is','it',
+    'me','my','no','of','oh','ok','on','or','so','to','up','us','we'
+}
+
+def _word_log_prob(word):
+    """log10 unigram probability of word, or None if it may not be used as a segment."""
+    if len(word) < 3 and word not in SAFE_SHORT_WORDS:
+        return None
+    count = loader.unigrams.get(word)
+    if count is None:
+        return None
+    # For segmentation, unigram probability is usually enough (no bigram context)
+    return math.log10(count / loader.total_unigrams)
 
 class AIRecommender:
     def __init__(self):
@@ -137,6 +161,7 @@ class AIRecommender:
         if not text: return 0.0
         return self._get_quadgram_score(text)
 
+    @STAGE_SECONDS.time(stage="quadgram_score")
     def _get_quadgram_score(self, text):
         """
         Method B: N-gram log-likelihood scoring (Quadgrams).
@@ -286,6 +311,58 @@ class AIRecommender:
         }
 
 
+    def score_sampled(self, candidates, window=256, min_windows=4, max_windows=16, z=3.0, seed=0, deadline=None):
+        """
+        Adaptive scoring for long candidate texts (e.g. the 26 Caesar shifts of a
+        big ciphertext). Every round scores the same random window of each
+        candidate with get_hybrid_score(). After min_windows rounds, a candidate
+        whose paired score difference to the leader is more than z standard
+        errors below zero is dropped; sampling stops once only the leader is left.
+        candidates: {key: text}
+        Returns: ({key: mean window score}, windows used), or (None, windows used)
+        when the windows cannot separate the leader from the runner-up (or the
+        texts are too short to sample) - score the full texts then.
+        deadline: optional time.monotonic() value checked before every round;
+        once it passes, returns the means of the windows scored so far
+        (None if there are none) - the caller can tell from the clock.
+        """
+        length = min(len(text) for text in candidates.values()) if candidates else 0
+        if len(candidates) < 2 or length < window * min_windows:
+            return None, 0
+
+        rng = random.Random(seed)
+        samples = {key: [] for key in candidates}
+        live = list(candidates)
+        for n in range(1, max_windows + 1):
+            if deadline is not None and time.monotonic() > deadline:
+                if n == 1:
+                    return None, 0
+                return {key: sum(s) / len(s) for key, s in samples.items()}, n - 1
+            start = rng.randrange(length - window + 1)
+            for key in live:
+                score, _ = self.get_hybrid_score(candidates[key][start:start + window])
+                samples[key].append(score)
+            if n < min_windows:
+                continue
+
+            leader = max(live, key=lambda k: sum(samples[k]))
+            still_close = [leader]
+            for key in live:
+                if key == leader:
+                    continue
+                diffs = [a - b for a, b in zip(samples[leader], samples[key])]
+                mean = sum(diffs) / n
+                stderr = math.sqrt(sum((d - mean) ** 2 for d in diffs) / (n - 1) / n)
+                if mean > z * stderr and mean > 0:
+                    CANDIDATES_PRUNED.inc(filter="sampled")
+                else:
+                    still_close.append(key)
+            live = still_close
+            if len(live) == 1:
+                return {key: sum(s) / len(s) for key, s in samples.items()}, n
+        return None, max_windows
+
+    @STAGE_SECONDS.time(stage="auto_correct")
     def auto_correct(self, text):
         """
         Corrects common typos using the loaded spell_errors dictionary.
@@ -310,12 +387,28 @@ class AIRecommender:
                 
         return ' '.join(corrected_words), corrections_made
 
+    @STAGE_SECONDS.time(stage="segment_text")
     def _segment_text(self, text):
         """
         Segments text into words using Viterbi algorithm.
+        Texts of STREAM_SEGMENT_MIN_LEN chars or more go through
+        StreamingSegmenter, so the DP tables stay bounded instead of growing
+        with the text.
         Returns: (segmented_text, score)
         """
         n = len(text)
+        if n >= STREAM_SEGMENT_MIN_LEN:
+            segmenter = StreamingSegmenter()
+            words = []
+            for start in range(0, n, 1000):
+                words.extend(segmenter.feed(text[start:start + 1000]))
+                if segmenter.uncovered:
+                    break # Some chars fit no word, like an unreachable dp[n]: no need to read on
+            else:
+                words.extend(segmenter.finish())
+            if segmenter.uncovered:
+                return None, -float('inf')
+            return ' '.join(words), segmenter.log_prob
         text = text.lower() # Fix case sensitivity for "Ilovesystemsecurity"
         # dp[i] = max log prob of text[0:i]
         dp = [-float('inf')] * (n + 1)
@@ -326,41 +419,15 @@ class AIRecommender:
         for i in range(1, n + 1):
             # Try all possible previous word boundaries j
             # Limit word length to 20 for performance
-            for j in range(max(0, i - 20), i):
-                word = text[j:i]
-                
-                # Check if word exists in unigrams
-                # STRICT SEGMENTATION: 
-                # Only allow verified short words (len < 3) to prevent garbage tiling.
-                # Must match strict list: 'a', 'i', 'is', 'to', etc.
-                is_safe_short = True
-                if len(word) < 3:
-                    safe_set = {
-                        'a','i',
-                        'am','an','as','at','be','by','do','go','he','hi','if','in','is','it',
-                        'me','my','no','of','oh','ok','on','or','so','to','up','us','we'
-                    }
-                    if word not in safe_set:
-                         is_safe_short = False
-                
-                if not is_safe_short:
+            for j in range(max(0, i - MAX_WORD_LEN), i):
+                log_prob = _word_log_prob(text[j:i])
+                if log_prob is None:
                     continue
-                    
-                if word in loader.unigrams:
-                    # Calculate score: dp[j] + log(P(word))
-                    # We can use unigram probability here.
-                    # Context (bigrams) is harder in simple Viterbi, but possible.
-                    # For segmentation, unigram + length bonus is usually enough.
-                    
-                    count = loader.unigrams[word]
-                    prob = count / loader.total_unigrams
-                    log_prob = math.log10(prob)
-                    
-                    current_score = dp[j] + log_prob
-                    
-                    if current_score > dp[i]:
-                        dp[i] = current_score
-                        path[i] = j
+                current_score = dp[j] + log_prob
+                
+                if current_score > dp[i]:
+                    dp[i] = current_score
+                    path[i] = j
                         
         # Reconstruct path
         if dp[n] == -float('inf'):
@@ -375,6 +442,18 @@ class AIRecommender:
             
         return ' '.join(reversed(segments)), dp[n]
 
+    def segment_stream(self, chunks, max_window=2000):
+        """
+        Streaming version of _segment_text() for huge unspaced texts.
+        chunks: iterable of text pieces (e.g. decrypted blocks as they arrive).
+        Yields words as soon as they are final. See StreamingSegmenter.
+        """
+        segmenter = StreamingSegmenter(max_window)
+        for chunk in chunks:
+            yield from segmenter.feed(chunk)
+        yield from segmenter.finish()
+
+    @STAGE_SECONDS.time(stage="analyze")
     def analyze(self, text):
         """
         Analyzes text using Hybrid Scoring (Method D).
@@ -447,8 +526,122 @@ class AIRecommender:
                 score = max(fast_score, res['score'])
             else:
                 score = fast_score
+                CANDIDATES_PRUNED.inc(filter="quadgram")
             
             if score > best_score:
                 best_score = score
                 
         return best_score
+
+
+class StreamingSegmenter:
+    """
+    Incremental Viterbi segmentation with bounded memory.
+    Same word model as AIRecommender._segment_text(), plus a heavy per-char
+    penalty for characters no word covers (merged into one token on output),
+    so a path always exists and junk does not stall the stream.
+    Words are emitted once every live path agrees on a boundary: any future
+    path must pass through one of the last MAX_WORD_LEN positions, so when all
+    of their back-pointer chains meet at position m, everything before m is
+    final. Only state after the last emitted boundary is kept; if the chains
+    have not met within max_window chars, the best path so far is committed.
+    """
+    UNKNOWN_CHAR_LOG_PROB = -20.0 # per char; below any dictionary word
+
+    def __init__(self, max_window=2000):
+        self.max_window = max(max_window, 2 * MAX_WORD_LEN)
+        self.text = ''     # chars since the last emitted boundary (lowercased)
+        self.dp = [0.0]    # dp[i]: best log prob of text[:i]
+        self.back = [-1]   # back[i]: start of the last segment ending at i
+        self.unknown = [False] # unknown[i]: that segment is an uncovered char
+        self.pending_unknown = '' # uncovered chars not yet emitted (merged with what follows)
+        self.uncovered = 0     # uncovered chars emitted so far
+        self.log_prob = 0.0    # log prob of the words emitted so far
+
+    def _extend(self, char):
+        self.text += char
+        i = len(self.text)
+        best, best_j, is_unknown = self.dp[i - 1] + self.UNKNOWN_CHAR_LOG_PROB, i - 1, True
+        for j in range(max(0, i - MAX_WORD_LEN), i):
+            log_prob = _word_log_prob(self.text[j:i])
+            if log_prob is not None and self.dp[j] + log_prob > best:
+                best, best_j, is_unknown = self.dp[j] + log_prob, j, False
+        self.dp.append(best)
+        self.back.append(best_j)
+        self.unknown.append(is_unknown)
+
+    def _chain(self, i):
+        """Boundaries on the best path ending at i, newest first (ends with 0)."""
+        chain = [i]
+        while i > 0:
+            i = self.back[i]
+            chain.append(i)
+        return chain
+
+    def _emit(self, end):
+        """Emits the best path's words up to boundary end and drops that state."""
+        words = []
+        boundaries = self._chain(end)
+        for k in range(len(boundaries) - 1, 0, -1):
+            start, stop = boundaries[k], boundaries[k - 1]
+            piece = self.text[start:stop]
+            if self.unknown[stop]:
+                self.pending_unknown += piece
+                self.uncovered += len(piece)
+                continue
+            if self.pending_unknown:
+                words.append(self.pending_unknown)
+                self.pending_unknown = ''
+            words.append(piece)
+
+        # Rebase so the kept state starts at 0 (also keeps dp values small)
+        offset = self.dp[end]
+        self.log_prob += offset
+        self.text = self.text[end:]
+        self.dp = [v - offset for v in self.dp[end:]]
+        self.back = [-1] + [b - end for b in self.back[end + 1:]]
+        self.unknown = [False] + self.unknown[end + 1:]
+        return words
+
+    def _finalized(self):
+        """Emits everything before the point where all live paths meet."""
+        n = len(self.text)
+        live = range(max(0, n - MAX_WORD_LEN + 1), n + 1)
+        on_main = set(self._chain(n))
+        meet = n
+        for i in live:
+            while i not in on_main:
+                i = self.back[i]
+            meet = min(meet, i)
+        if meet > 0:
+            return self._emit(meet)
+        if n > self.max_window:
+            # No agreement within the window: commit the best path up to MAX_WORD_LEN back
+            best = max(live, key=lambda i: self.dp[i])
+            cut = next(b for b in self._chain(best) if b <= n - MAX_WORD_LEN)
+            if cut > 0:
+                words = self._emit(cut)
+                # Paths that did not go through cut are gone; rescore the kept tail from it
+                tail = self.text
+                self.text, self.dp, self.back, self.unknown = '', [0.0], [-1], [False]
+                for char in tail:
+                    self._extend(char)
+                return words
+        return []
+
+    def feed(self, chunk):
+        """Consumes more text. Returns the words that became final."""
+        words = []
+        for char in chunk.lower():
+            self._extend(char)
+            if len(self.text) % MAX_WORD_LEN == 0:
+                words.extend(self._finalized())
+        return words
+
+    def finish(self):
+        """Ends the stream. Returns the remaining words."""
+        words = self._emit(len(self.text)) if self.text else []
+        if self.pending_unknown:
+            words.append(self.pending_unknown)
+            self.pending_unknown = ''
+        return words
@@ -1,78 +1,403 @@
-from flask import Flask, render_template, request, jsonify
+import os
+import gc
+import copy
+import json
+import time
+import functools
+import threading
+from collections import deque
+from flask import (Blueprint, Flask, Response, current_app, g, render_template, request, session,
+                   jsonify, stream_with_context)
 from caesar_cipher import CaesarCipher, CaesarAttacker
-from transposition_cipher import TranspositionCipher, TranspositionAttacker
+from transposition_cipher import TranspositionCipher, TranspositionAttacker, checkpoint_path
 from rsa_cipher import RSACipher, RSAAttacker
+from jobs import JobManager, QueueFullError
+from result_cache import ResultCache
+from knowledge_base import loader
+from admission import AdmissionController, Overloaded
+from ai_recommender import AIRecommender
+from profiling import PROFILE_MODES, new_profile_id, profile_call
+import metrics
 
-app = Flask(__name__)
+DEFAULT_CONFIG = {
+    # Hard cap on request bodies (batch endpoints included); Flask answers 413 above it
+    'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,
 
-# Initialize Ciphers
-caesar = CaesarCipher()
-caesar_cracker = CaesarAttacker()
-trans = TranspositionCipher()
-trans_cracker = TranspositionAttacker()
-rsa = RSACipher()
-rsa_cracker = RSAAttacker()
+    # Per-route attack limits: max ciphertext length (chars) and time budget (seconds).
+    # When the budget runs out the attackers return their best-so-far ranking.
+    'ROUTE_LIMITS': {
+        'caesar': {'max_chars': 20000, 'deadline': 10.0},
+        # A full transposition sweep takes ~5-10s on short UI texts and grows with length
+        'transposition': {'max_chars': 1000, 'deadline': 60.0},
+        'rsa': {'max_chars': 100000, 'deadline': 10.0},
+    },
 
-# In-memory storage for RSA keys (per session simulation)
-rsa_keys = {
-    "public": None,
-    "private": None
+    # Worker processes per batch attack request. Each batch holds a single
+    # admission slot, so up to ADMISSION_MAX_CONCURRENT x BATCH_WORKERS
+    # processes can run at once; 1 attacks in the request thread (no fork).
+    'BATCH_WORKERS': int(os.environ.get('BATCH_WORKERS', '1')),
+
+    # Background attack jobs (bounded worker pool)
+    'JOB_WORKERS': 2,
+    'JOB_MAX_PENDING': 32,
+
+    # Attack result cache (LRU + optional SQLite file)
+    'CACHE_ENTRIES': 256,
+    'CACHE_DB': os.environ.get('ATTACK_CACHE_DB'),
+
+    # Concurrency limiter for attack routes (429 when the queue is full, 503 on queue timeout)
+    'ADMISSION_MAX_CONCURRENT': 4,
+    'ADMISSION_MAX_QUEUE': 8,
+    'ADMISSION_QUEUE_TIMEOUT': 5.0,
+
+    # Prometheus-style metrics (METRICS_ENABLED=0 turns recording off)
+    'METRICS_ENABLED': os.environ.get('METRICS_ENABLED', '1') != '0',
+
+    # Per-request profiling of attack routes. When set, a request with
+    # "X-Profile: cprofile|sample" is profiled and the profile saved here as
+    # <id>.pstats / <id>.collapsed (id from X-Request-Id or random, echoed in
+    # X-Profile-Id). Unset = the header is ignored and nothing is wrapped.
+    'PROFILE_DIR': os.environ.get('PROFILE_DIR'),
+
+    # Transposition attack jobs save their progress here and resume from it
+    # if the worker restarts (unset = no checkpoints).
+    'CHECKPOINT_DIR': os.environ.get('ATTACK_CHECKPOINT_DIR'),
+
+    # Signs the session cookie holding the user's RSA keys. Set SECRET_KEY when
+    # running several workers so every worker accepts the same cookies.
+    'SECRET_KEY': os.environ.get('SECRET_KEY') or os.urandom(32),
 }
 
-@app.route('/')
+api = Blueprint('api', __name__)
+
+
+class Services:
+    """
+    Shared state of one app instance.
+    Ciphers are stateless and shared; attackers are created per thread, so
+    request threads never share attacker state.
+    """
+    def __init__(self, config):
+        self.caesar = CaesarCipher()
+        self.trans = TranspositionCipher()
+        self.rsa = RSACipher()
+        self.job_manager = JobManager(max_workers=config['JOB_WORKERS'], max_pending=config['JOB_MAX_PENDING'])
+        self.result_cache = ResultCache(loader.version, max_entries=config['CACHE_ENTRIES'],
+                                        db_path=config['CACHE_DB'])
+        self.admission = AdmissionController(
+            max_concurrent=config['ADMISSION_MAX_CONCURRENT'],
+            max_queue=config['ADMISSION_MAX_QUEUE'],
+            queue_timeout=config['ADMISSION_QUEUE_TIMEOUT']
+        )
+        self.ready = threading.Event()
+        self._local = threading.local()
+
+    def attacker(self, kind):
+        """Returns this thread's attacker for kind ('caesar', 'transposition' or 'rsa')."""
+        attackers = getattr(self._local, 'attackers', None)
+        if attackers is None:
+            attackers = self._local.attackers = {
+                'caesar': CaesarAttacker(),
+                'transposition': TranspositionAttacker(),
+                'rsa': RSAAttacker(),
+            }
+        return attackers[kind]
+
+    def warm_up(self):
+        """
+        Touches the language model and scoring paths once, then freezes the
+        heap so forked workers share the model pages copy-on-write (gc would
+        otherwise write to every object header when it scans them).
+        """
+        AIRecommender().analyze("warmupthelanguagemodel")
+        gc.collect()
+        gc.freeze()
+        self.ready.set()
+
+
+def create_app(config=None):
+    """
+    App factory. The language model is loaded when knowledge_base is imported,
+    i.e. before this returns, so with a pre-forking server
+    (e.g. gunicorn --preload "app:create_app()") workers inherit it instead
+    of loading their own copy.
+    """
+    app = Flask(__name__)
+    app.config.update(copy.deepcopy(DEFAULT_CONFIG))
+    app.config.update(config or {})
+
+    services = Services(app.config)
+    app.extensions['crypto'] = services
+    app.register_blueprint(api)
+
+    metrics.registry.enabled = app.config['METRICS_ENABLED']
+    metrics.registry.gauge('crypto_admission_running', 'Attack requests currently running.',
+                           lambda: services.admission.stats()['running'])
+    metrics.registry.gauge('crypto_admission_waiting', 'Attack requests waiting for a slot.',
+                           lambda: services.admission.stats()['waiting'])
+    metrics.registry.gauge('crypto_cache_memory_bytes', 'Bytes held by the in-process result cache.',
+                           lambda: services.result_cache.stats()['memory_bytes'])
+
+    services.warm_up()
+    return app
+
+
+def svc():
+    """Services of the app handling the current request."""
+    return current_app.extensions['crypto']
+
+def _too_long(kind, text):
+    """Returns an error message if text exceeds the route's input limit."""
+    max_chars = current_app.config['ROUTE_LIMITS'][kind]['max_chars']
+    if text is not None and len(text) > max_chars:
+        return f'Input too long for {kind} attack ({len(text)} > {max_chars} characters)'
+    return None
+
+def admitted(kind):
+    """
+    Decorator for attack routes: enforces the input limit, takes an admission
+    slot and sets g.deadline from the route's time budget. Streamed responses
+    keep their slot until the stream is closed. Honors the opt-in X-Profile
+    header (see PROFILE_DIR); for streamed routes only the setup is profiled.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if data is None:
+                data = {}
+            if not isinstance(data, dict):
+                return jsonify({'error': 'Request body must be a JSON object'}), 400
+            if not isinstance(data.get('text', ''), str):
+                return jsonify({'error': 'text must be a string'}), 400
+            error = _too_long(kind, data.get('text'))
+            if error:
+                return jsonify({'error': error}), 413
+            profile_mode = request.headers.get('X-Profile') if current_app.config['PROFILE_DIR'] else None
+            if profile_mode and profile_mode not in PROFILE_MODES:
+                return jsonify({'error': f'X-Profile must be one of: {", ".join(PROFILE_MODES)}'}), 400
+            try:
+                svc().admission.acquire()
+            except Overloaded as err:
+                return jsonify({'error': str(err)}), err.status, {'Retry-After': '1'}
+
+            g.deadline = time.monotonic() + current_app.config['ROUTE_LIMITS'][kind]['deadline']
+            streamed = False
+            try:
+                if profile_mode:
+                    profile_id = new_profile_id(request.headers.get('X-Request-Id'))
+                    result, _ = profile_call(view, *args, mode=profile_mode, profile_id=profile_id,
+                                             out_dir=current_app.config['PROFILE_DIR'], **kwargs)
+                    response = current_app.make_response(result)
+                    response.headers['X-Profile-Id'] = profile_id
+                else:
+                    response = current_app.make_response(view(*args, **kwargs))
+                if response.is_streamed:
+                    response.call_on_close(svc().admission.release)
+                    streamed = True
+                return response
+            finally:
+                if not streamed:
+                    svc().admission.release()
+        return wrapper
+    return decorator
+
+def _run_attack(events):
+    """Drains an attack_iter() generator. Returns its 'done' event."""
+    for event in events:
+        if event['event'] == 'done':
+            return event
+    return {'event': 'done', 'results': [], 'complete': False}
+
+@api.route('/')
 def index():
     return render_template('index.html')
 
 # --- CAESAR ROUTES ---
-@app.route('/api/caesar/encrypt', methods=['POST'])
+@api.route('/api/caesar/encrypt', methods=['POST'])
 def caesar_encrypt():
     data = request.json
     text = data.get('text')
     shift = int(data.get('shift', 0))
-    result = caesar.encrypt(text, shift)
+    result = svc().caesar.encrypt(text, shift)
     return jsonify({'result': result})
 
-@app.route('/api/caesar/decrypt', methods=['POST'])
+@api.route('/api/caesar/decrypt', methods=['POST'])
 def caesar_decrypt():
     data = request.json
     text = data.get('text')
     shift = int(data.get('shift', 0))
-    result = caesar.decrypt(text, shift)
+    result = svc().caesar.decrypt(text, shift)
     return jsonify({'result': result})
 
-@app.route('/api/caesar/attack', methods=['POST'])
+@api.route('/api/caesar/attack', methods=['POST'])
+@admitted('caesar')
 def caesar_attack():
     data = request.json
     text = data.get('text')
-    results = caesar_cracker.attack(text)
-    return jsonify({'results': results[:5]}) # Return top 5
+    cached = svc().result_cache.get('caesar', {}, text)
+    if cached is not None:
+        return jsonify(cached)
+    done = _run_attack(svc().attacker('caesar').attack_iter(text, deadline=g.deadline))
+    payload = {'results': done['results'][:5], 'partial': not done.get('complete', True)} # Return top 5
+    if not payload['partial']:
+        svc().result_cache.put('caesar', {}, text, payload)
+    return jsonify(payload)
+
+@api.route('/api/caesar/attack/stream', methods=['POST'])
+@admitted('caesar')
+def caesar_attack_stream():
+    data = request.json
+    text = data.get('text')
+    return _event_stream(svc().attacker('caesar').attack_iter(text, deadline=g.deadline))
+
+@api.route('/api/caesar/attack/batch', methods=['POST'])
+@admitted('caesar')
+def caesar_attack_batch():
+    return _batch_response('caesar', svc().attacker('caesar').attack_many)
 
 # --- TRANSPOSITION ROUTES ---
-@app.route('/api/transposition/encrypt', methods=['POST'])
+@api.route('/api/transposition/encrypt', methods=['POST'])
 def trans_encrypt():
     data = request.json
     text = data.get('text')
     key = data.get('key')
-    result = trans.encrypt(text, key)
+    result = svc().trans.encrypt(text, key)
     return jsonify({'result': result})
 
-@app.route('/api/transposition/decrypt', methods=['POST'])
+@api.route('/api/transposition/decrypt', methods=['POST'])
 def trans_decrypt():
     data = request.json
     text = data.get('text')
     key = data.get('key')
-    result = trans.decrypt(text, key)
+    result = svc().trans.decrypt(text, key)
     return jsonify({'result': result})
 
-@app.route('/api/transposition/attack', methods=['POST'])
+@api.route('/api/transposition/attack', methods=['POST'])
+@admitted('transposition')
 def trans_attack():
     data = request.json
     text = data.get('text')
-    results = trans_cracker.attack(text)
-    return jsonify({'results': results[:5]})
+    stop_early = bool(data.get('stop_early', False))
+    params = {'max_key_len': svc().attacker('transposition').MAX_KEY_LEN_BRUTE, 'stop_early': stop_early}
+    cached = svc().result_cache.get('transposition', params, text)
+    if cached is not None:
+        return jsonify(cached)
+    done = _run_attack(svc().attacker('transposition').attack_iter(
+        text, deadline=g.deadline, stop_early=stop_early))
+    payload = {'results': done['results'][:5], 'partial': not done.get('complete', True)}
+    if stop_early:
+        payload['stopped_early'] = done.get('stopped_early', False)
+        payload['skipped'] = done.get('skipped', 0.0) # Fraction of the keyspace left unsearched
+    if not payload['partial']:
+        svc().result_cache.put('transposition', params, text, payload)
+    return jsonify(payload)
+
+@api.route('/api/transposition/attack/stream', methods=['POST'])
+@admitted('transposition')
+def trans_attack_stream():
+    data = request.json
+    text = data.get('text')
+    return _event_stream(svc().attacker('transposition').attack_iter(
+        text, deadline=g.deadline, stop_early=bool(data.get('stop_early', False))))
+
+@api.route('/api/transposition/attack/batch', methods=['POST'])
+@admitted('transposition')
+def trans_attack_batch():
+    return _batch_response('transposition', svc().attacker('transposition').attack_many)
+
+def _batch_texts():
+    """
+    Ciphertexts for a batch request: either a JSON body {"texts": [...]}
+    or an application/x-ndjson body with one JSON string per line
+    (read lazily from the request stream). Lines that are not valid JSON
+    are yielded as None, so they get an error line like other non-strings.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        for line in request.stream:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+    else:
+        yield from (request.json or {}).get('texts', [])
+
+def _batch_item_error(kind, text):
+    """Returns an error message for a batch item that cannot be attacked."""
+    if not isinstance(text, str):
+        return 'Batch items must be strings'
+    return _too_long(kind, text)
+
+def _batch_response(kind, attack_many):
+    """
+    Runs attack_many over the request's ciphertexts and streams JSON Lines back.
+    Each ciphertext gets the route's time budget; texts over the input limit
+    are not attacked and get an error line instead. A JSON body with a
+    non-string item is rejected up front with a 400; NDJSON is read lazily,
+    so a non-string line gets an error line. Runs on BATCH_WORKERS
+    processes, never one per CPU, so the admission limit stays meaningful.
+    """
+    time_budget = current_app.config['ROUTE_LIMITS'][kind]['deadline']
+    workers = current_app.config['BATCH_WORKERS']
+    if request.mimetype != 'application/x-ndjson':
+        data = request.get_json(silent=True)
+        texts = data.get('texts', []) if isinstance(data, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'texts must be a list of strings'}), 400
+
+    def generate():
+        order = deque() # (index, error or None) for every text read so far
+
+        def accepted():
+            for index, text in enumerate(_batch_texts()):
+                error = _batch_item_error(kind, text)
+                order.append((index, error))
+                if not error:
+                    yield text
+
+        def rejected_lines():
+            while order and order[0][1]:
+                index, error = order.popleft()
+                yield json.dumps({'index': index, 'error': error}) + "\n"
+
+        for results in attack_many(accepted(), workers=workers, time_budget=time_budget):
+            yield from rejected_lines()
+            index, _ = order.popleft()
+            yield json.dumps({'index': index, 'results': results}) + "\n"
+        yield from rejected_lines()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _event_stream(events):
+    """
+    Relays attack_iter() events as Server-Sent Events.
+    Each event is sent as 'event: <type>' + 'data: <json>'; the final
+    'done' event is trimmed to the top 5 like the regular attack routes.
+    """
+    def generate():
+        for event in events:
+            kind = event['event']
+            if kind == 'done':
+                payload = {'results': event['results'][:5], 'partial': not event.get('complete', True)}
+                if 'stopped_early' in event:
+                    payload['stopped_early'] = event['stopped_early']
+                    payload['skipped'] = event['skipped']
+            elif kind == 'candidate':
+                payload = event['candidate']
+            else:
+                payload = {'done': event['done'], 'total': event['total'], 'top': event['top']}
+            yield f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 # --- RSA ROUTES ---
-@app.route('/api/rsa/generate', methods=['POST'])
+@api.route('/api/rsa/generate', methods=['POST'])
 def rsa_generate():
     data = request.json
     strength = data.get('strength', 'strong')
@@ -81,83 +406,186 @@ def rsa_generate():
     if strength == 'weak':
         keysize = 32 # Small enough to brute force quickly
         
-    pub, priv = rsa.generate_keys(keysize=keysize)
-    rsa_keys['public'] = pub
-    rsa_keys['private'] = priv
+    pub, priv = svc().rsa.generate_keys(keysize=keysize)
     
     # Convert to strings for JSON transport (prevent JS precision loss)
     pub_str = (str(pub[0]), str(pub[1]))
     priv_str = (str(priv[0]), str(priv[1]))
+    # Keys live in the user's (signed) session cookie, not in process memory,
+    # so they survive across worker processes and never leak between users
+    session['rsa_public'] = pub_str
+    session['rsa_private'] = priv_str
     return jsonify({'public': pub_str, 'private': priv_str})
 
-@app.route('/api/rsa/encrypt', methods=['POST'])
+@api.route('/api/rsa/encrypt', methods=['POST'])
 def rsa_encrypt():
     data = request.json
     text = data.get('text')
     e = data.get('e')
     n = data.get('n')
+    fmt = data.get('format', 'decimal') # 'decimal' (legacy) or 'base64' (compact)
     
     # Use stored keys if not provided
     if not e or not n:
-        if rsa_keys['public']:
-            e, n = rsa_keys['public']
+        if session.get('rsa_public'):
+            e, n = session['rsa_public']
         else:
             return jsonify({'error': 'No public key provided or generated'}), 400
             
-    cipher_ints = rsa.encrypt(text, (int(e), int(n)))
-    return jsonify({'result': ' '.join(map(str, cipher_ints))})
+    try:
+        cipher_ints = svc().rsa.encrypt(text, (int(e), int(n)))
+        result = svc().rsa.format_ciphertext(cipher_ints, int(n), fmt)
+    except ValueError as err:
+        return jsonify({'error': str(err)}), 400
+    return jsonify({'result': result, 'format': fmt})
 
-@app.route('/api/rsa/decrypt', methods=['POST'])
+@api.route('/api/rsa/decrypt', methods=['POST'])
 def rsa_decrypt():
     data = request.json
-    text = data.get('text') # Space separated ints
+    text = data.get('text') # Space separated ints or base64 container
     d = data.get('d')
     n = data.get('n')
     
     if not d or not n:
-        if rsa_keys['private']:
-            d, n = rsa_keys['private']
+        if session.get('rsa_private'):
+            d, n = session['rsa_private']
         else:
             return jsonify({'error': 'No private key provided or generated'}), 400
             
     try:
-        cipher_ints = list(map(int, text.strip().split()))
-        result = rsa.decrypt(cipher_ints, (int(d), int(n)))
+        cipher_ints = svc().rsa.parse_ciphertext(text)
+        result = svc().rsa.decrypt(cipher_ints, (int(d), int(n)))
         return jsonify({'result': result})
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
-@app.route('/api/rsa/attack', methods=['POST'])
+@api.route('/api/rsa/attack', methods=['POST'])
+@admitted('rsa')
 def rsa_attack():
     data = request.json
-    text = data.get('text') # Ciphertext ints
+    text = data.get('text') # Ciphertext (decimal ints or base64)
     e = int(data.get('e'))
     n = int(data.get('n'))
+    portfolio = bool(data.get('portfolio', False)) # Race all strategies (see RSAAttacker.attack_portfolio)
     
     try:
-        cipher_ints = list(map(int, text.strip().split()))
-        
-        # 1. Recover Private Key
-        attack_result = rsa_cracker.attack((e, n))
-        
-        if attack_result:
-            recovered_key = attack_result['private_key']
-            details = attack_result['details']
-            
-            # 2. Decrypt
-            decrypted = rsa.decrypt(cipher_ints, recovered_key)
-            return jsonify({
-                'success': True,
-                'private_key': recovered_key,
-                'decrypted': decrypted,
-                'details': details
-            })
+        params = {'e': str(e), 'n': str(n), 'portfolio': portfolio}
+        cached = svc().result_cache.get('rsa', params, text)
+        if cached is not None:
+            return jsonify(cached)
+        result = _rsa_attack(svc(), text, e, n, deadline=g.deadline, portfolio=portfolio)
+        if result['success']:
+            svc().result_cache.put('rsa', params, text, result)
+            return jsonify(result)
         else:
-            return jsonify({'success': False, 'message': 'Failed to factorize n'}), 400
+            return jsonify(result), 400
             
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def _rsa_attack(services, text, e, n, deadline=None, portfolio=False):
+    cipher_ints = services.rsa.parse_ciphertext(text)
+    
+    # 1. Recover Private Key
+    if portfolio:
+        attack_result = services.attacker('rsa').attack_portfolio((e, n), deadline=deadline)
+    else:
+        attack_result = services.attacker('rsa').attack((e, n), deadline=deadline)
+    
+    if not attack_result or not attack_result['private_key']:
+        result = {'success': False, 'message': 'Failed to factorize n'}
+    else:
+        recovered_key = attack_result['private_key']
+        # 2. Decrypt
+        result = {
+            'success': True,
+            'private_key': recovered_key,
+            'decrypted': services.rsa.decrypt(cipher_ints, recovered_key),
+            'details': attack_result['details']
+        }
+    if portfolio:
+        result['method'] = attack_result['method']
+        result['timings'] = attack_result['timings']
+    return result
+
+@api.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests."""
+    return jsonify({'status': 'ok'})
+
+@api.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: the model is loaded and warmed up."""
+    services = svc()
+    if not services.ready.is_set():
+        return jsonify({'status': 'starting'}), 503
+    return jsonify({
+        'status': 'ready',
+        'model_version': loader.version,
+        'admission': services.admission.stats(),
+    })
+
+@api.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.registry.expose(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(svc().result_cache.stats())
+
+# --- BACKGROUND JOBS ---
+# Each target runs on the job pool (outside the request context) and returns the final payload.
+def _caesar_job(job, services, text):
+    results = services.attacker('caesar').attack(text, progress=job.update)
+    return {'results': results[:5]}
+
+def _transposition_job(job, services, text, checkpoint_dir=None):
+    checkpoint = checkpoint_path(checkpoint_dir, text) if checkpoint_dir else None
+    results = services.attacker('transposition').attack(text, progress=job.update, checkpoint=checkpoint)
+    return {'results': results[:5]}
+
+def _rsa_job(job, services, text, e, n, portfolio=False):
+    return _rsa_attack(services, text, e, n, portfolio=portfolio)
+
+@api.route('/api/jobs', methods=['POST'])
+def submit_job():
+    data = request.json
+    job_type = data.get('type')
+    text = data.get('text')
+    if not text:
+        return jsonify({'error': 'No ciphertext provided'}), 400
+    if job_type in current_app.config['ROUTE_LIMITS']:
+        error = _too_long(job_type, text)
+        if error:
+            return jsonify({'error': error}), 413
+        
+    try:
+        if job_type == 'caesar':
+            job = svc().job_manager.submit(job_type, _caesar_job, svc(), text)
+        elif job_type == 'transposition':
+            job = svc().job_manager.submit(job_type, _transposition_job, svc(), text,
+                                           current_app.config['CHECKPOINT_DIR'])
+        elif job_type == 'rsa':
+            e = int(data.get('e'))
+            n = int(data.get('n'))
+            job = svc().job_manager.submit(job_type, _rsa_job, svc(), text, e, n,
+                                           bool(data.get('portfolio', False)))
+        else:
+            return jsonify({'error': f'Unknown job type: {job_type}'}), 400
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid RSA public key'}), 400
+        
+    return jsonify({'job_id': job.id, 'status': job.status}), 202
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = svc().job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,272 @@
+"""
+Performance benchmarks.
+Every input is generated from fixed seeds and a fixed corpus, so numbers
+from different runs (and different versions) are comparable.
+Run: python benchmarks.py [--repeat N] [--only GROUP,...] [--json FILE] [--compare FILE]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import time
+
+from bigint import available_backends
+from rsa_cipher import RSACipher, RSAAttacker
+
+# Fixed corpus for the classical ciphers and the scorer
+CORPUS = (
+    "it was the best of times it was the worst of times it was the age of wisdom "
+    "it was the age of foolishness it was the epoch of belief it was the epoch of "
+    "incredulity it was the season of light it was the season of darkness it was "
+    "the spring of hope it was the winter of despair we had everything before us "
+    "we had nothing before us we were all going direct to heaven we were all going "
+    "direct the other way "
+)
+
+TEXT_SIZES = (32, 128, 512)
+CIPHER_SIZES = (1000, 10000, 100000)
+RSA_SIZES = (512, 1024, 2048)
+FACTOR_BITS = (40, 48, 56)
+
+
+def corpus_text(length, spaces=True):
+    """First `length` characters of the corpus (repeated as needed)."""
+    text = CORPUS if spaces else CORPUS.replace(' ', '')
+    return (text * (length // len(text) + 1))[:length]
+
+
+def _time_it(func, repeat):
+    """Runs func repeat times. Returns the best wall-clock time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_backends(repeat=3, keysize=1024, factor_bits=56):
+    """
+    Compares RSA keygen, decrypt and factoring under every available
+    big-integer backend. Inputs are generated from fixed seeds so each
+    backend sees exactly the same numbers.
+    Returns: {backend: {operation: seconds}}
+    """
+    random.seed(1234)
+    reference = RSACipher("native")
+    pub, priv = reference.generate_keys(keysize)
+    ciphertext = reference.encrypt("The quick brown fox jumps over the lazy dog. " * 20, pub)
+    weak_pub, _ = reference.generate_keys(factor_bits)
+
+    results = {}
+    for name in available_backends():
+        rsa = RSACipher(name)
+        attacker = RSAAttacker(name)
+
+        def keygen():
+            random.seed(42)
+            rsa.generate_keys(keysize)
+
+        def decrypt():
+            rsa.decrypt(ciphertext, priv)
+
+        def factor():
+            random.seed(7)
+            attacker._pollards_rho_iterative(weak_pub[1])
+
+        results[name] = {
+            f"keygen_{keysize}": _time_it(keygen, repeat),
+            f"decrypt_{keysize}": _time_it(decrypt, repeat),
+            f"factor_rho_{factor_bits}": _time_it(factor, repeat),
+        }
+    return results
+
+
+def bench_loader(repeat=1):
+    """Startup cost of building the language model from the frequency files."""
+    from knowledge_base import FrequencyLoader
+    return {"loader_startup": _time_it(FrequencyLoader, repeat)}
+
+
+def bench_scoring(repeat=3):
+    """AIRecommender hot paths across input sizes."""
+    from ai_recommender import AIRecommender
+    ai = AIRecommender()
+    results = {}
+    for size in TEXT_SIZES:
+        spaced = corpus_text(size)
+        unspaced = corpus_text(size, spaces=False)
+        results[f"quadgram_score_{size}"] = _time_it(lambda: ai._get_quadgram_score(unspaced), repeat)
+        results[f"segment_text_{size}"] = _time_it(lambda: ai._segment_text(unspaced), repeat)
+        results[f"hybrid_score_spaced_{size}"] = _time_it(lambda: ai.get_hybrid_score(spaced), repeat)
+        results[f"hybrid_score_unspaced_{size}"] = _time_it(lambda: ai.get_hybrid_score(unspaced), repeat)
+    return results
+
+
+def bench_caesar(repeat=3):
+    """Caesar encrypt/decrypt across sizes, and the full 26-shift attack."""
+    from caesar_cipher import CaesarCipher, CaesarAttacker
+    caesar = CaesarCipher()
+    attacker = CaesarAttacker()
+    results = {}
+    for size in CIPHER_SIZES:
+        text = corpus_text(size)
+        ciphertext = caesar.encrypt(text, 11)
+        results[f"caesar_encrypt_{size}"] = _time_it(lambda: caesar.encrypt(text, 11), repeat)
+        results[f"caesar_decrypt_{size}"] = _time_it(lambda: caesar.decrypt(ciphertext, 11), repeat)
+    for size in TEXT_SIZES:
+        ciphertext = caesar.encrypt(corpus_text(size), 11)
+        results[f"caesar_attack_{size}"] = _time_it(lambda: attacker.attack(ciphertext), repeat)
+    return results
+
+
+def bench_transposition(repeat=3):
+    """
+    Transposition encrypt/decrypt across sizes, and the brute-force attack.
+    The attack runs once per length: it takes seconds even on short texts.
+    """
+    from transposition_cipher import TranspositionCipher, TranspositionAttacker
+    trans = TranspositionCipher()
+    attacker = TranspositionAttacker()
+    results = {}
+    for size in CIPHER_SIZES:
+        text = corpus_text(size)
+        ciphertext = trans.encrypt(text, "ZEBRAS")
+        results[f"transposition_encrypt_{size}"] = _time_it(lambda: trans.encrypt(text, "ZEBRAS"), repeat)
+        results[f"transposition_decrypt_{size}"] = _time_it(lambda: trans.decrypt(ciphertext, "ZEBRAS"), repeat)
+    for size in (6, 8):
+        ciphertext = trans.encrypt(corpus_text(size, spaces=False), "BAC")
+        results[f"transposition_attack_{size}"] = _time_it(lambda: attacker.attack(ciphertext), 1)
+    return results
+
+
+def bench_rsa(repeat=3):
+    """RSA keygen/encrypt/decrypt across modulus sizes, and factoring weak moduli."""
+    rsa = RSACipher()
+    attacker = RSAAttacker()
+    message = corpus_text(256)
+    results = {}
+    for keysize in RSA_SIZES:
+        random.seed(keysize)
+        pub, priv = rsa.generate_keys(keysize)
+        ciphertext = rsa.encrypt(message, pub)
+
+        def keygen():
+            random.seed(42)
+            rsa.generate_keys(keysize)
+
+        # 2048-bit keygen takes seconds in pure Python; one run is enough
+        results[f"rsa_keygen_{keysize}"] = _time_it(keygen, 1 if keysize >= 2048 else repeat)
+        results[f"rsa_encrypt_{keysize}"] = _time_it(lambda: rsa.encrypt(message, pub), repeat)
+        results[f"rsa_decrypt_{keysize}"] = _time_it(lambda: rsa.decrypt(ciphertext, priv), repeat)
+    for bits in FACTOR_BITS:
+        random.seed(bits)
+        weak_pub, _ = rsa.generate_keys(bits)
+
+        def factor():
+            random.seed(7)
+            attacker._pollards_rho_iterative(weak_pub[1])
+
+        results[f"rsa_factor_rho_{bits}"] = _time_it(factor, repeat)
+    return results
+
+
+GROUPS = {
+    "loader": bench_loader,
+    "scoring": bench_scoring,
+    "caesar": bench_caesar,
+    "transposition": bench_transposition,
+    "rsa": bench_rsa,
+}
+
+
+def run_suite(groups=None, repeat=3):
+    """
+    Runs the selected benchmark groups (all by default).
+    Attacker progress output is discarded so it does not skew the timings.
+    Returns: {operation: seconds}
+    """
+    results = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name in groups or GROUPS:
+            if name == "loader":
+                results.update(GROUPS[name]())
+            else:
+                results.update(GROUPS[name](repeat))
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Prints each operation against a saved baseline.
+    Returns the operations that got slower by more than tolerance (fraction).
+    """
+    slower = []
+    print(f"{'operation':<32}{'baseline':>12}{'current':>12}{'change':>9}")
+    for op, seconds in results.items():
+        old = baseline.get(op)
+        if old is None:
+            print(f"{op:<32}{'-':>12}{seconds:>11.5f}s{'new':>9}")
+            continue
+        change = (seconds - old) / old if old else 0.0
+        flag = ''
+        if change > tolerance:
+            slower.append(op)
+            flag = '  <-- slower'
+        print(f"{op:<32}{old:>11.5f}s{seconds:>11.5f}s{change:>+8.0%}{flag}")
+    return slower
+
+
+def print_table(results):
+    operations = list(next(iter(results.values())))
+    print(f"{'operation':<20}" + ''.join(f"{name:>12}" for name in results))
+    for op in operations:
+        print(f"{op:<20}" + ''.join(f"{results[name][op]:>11.4f}s" for name in results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the crypto hot paths.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--only", help=f"comma-separated groups: {', '.join(GROUPS)}, backends")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a JSON file written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slowdown reported as a regression (default 0.1)")
+    args = parser.parse_args()
+
+    selected = args.only.split(',') if args.only else list(GROUPS) + ["backends"]
+    unknown = [g for g in selected if g not in GROUPS and g != "backends"]
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(unknown)}")
+
+    results = run_suite([g for g in selected if g in GROUPS], repeat=args.repeat)
+    if results:
+        print(f"{'operation':<32}{'seconds':>12}")
+        for op, seconds in results.items():
+            print(f"{op:<32}{seconds:>11.5f}s")
+
+    backends = None
+    if "backends" in selected:
+        print("\nBig-integer backends:")
+        backends = bench_backends(repeat=args.repeat)
+        print_table(backends)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "results": results,
+                "backends": backends,
+            }, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        if compare(results, baseline["results"], args.tolerance):
+            raise SystemExit(1)
@@ -0,0 +1,122 @@
+import math
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
+class PythonBackend:
+    """
+    Reference backend: the original hand-written Euclid loops.
+    Kept for comparison in benchmarks; slowest of the three.
+    """
+    name = "python"
+
+    def big(self, n):
+        """n in this backend's native integer type, for bulk arithmetic (product/remainder trees)."""
+        return n
+
+    def powmod(self, base, exp, mod):
+        return pow(base, exp, mod)
+
+    def gcd(self, a, b):
+        while b != 0:
+            a, b = b, a % b
+        return a
+
+    def mod_inverse(self, a, m):
+        m0 = m
+        y = 0
+        x = 1
+        if m == 1:
+            return 0
+        while a > 1:
+            if m == 0:
+                raise ValueError("base is not invertible for the given modulus")
+            # q is quotient
+            q = a // m
+            t = m
+            # m is remainder now, process same as Euclid's algo
+            m = a % m
+            a = t
+            t = y
+            # Update y and x
+            y = x - q * y
+            x = t
+        if x < 0:
+            x += m0
+        return x
+
+    def isqrt(self, n):
+        return math.isqrt(n)
+
+
+class NativeBackend(PythonBackend):
+    """
+    CPython built-ins implemented in C: math.gcd and pow(x, -1, m).
+    Always available; the default when gmpy2 is not installed.
+    """
+    name = "native"
+
+    def gcd(self, a, b):
+        return math.gcd(a, b)
+
+    def mod_inverse(self, a, m):
+        # Raises ValueError if a is not invertible mod m
+        return pow(a, -1, m)
+
+
+class Gmpy2Backend(PythonBackend):
+    """
+    GMP-backed arithmetic via the optional gmpy2 package.
+    Results are converted back to int so callers never see mpz values
+    (except from big(), which is meant for bulk arithmetic).
+    """
+    name = "gmpy2"
+
+    def big(self, n):
+        return gmpy2.mpz(n)
+
+    def powmod(self, base, exp, mod):
+        return int(gmpy2.powmod(base, exp, mod))
+
+    def gcd(self, a, b):
+        return int(gmpy2.gcd(a, b))
+
+    def mod_inverse(self, a, m):
+        if m == 1:
+            return 0
+        try:
+            return int(gmpy2.invert(a, m))
+        except ZeroDivisionError:
+            raise ValueError("base is not invertible for the given modulus")
+
+    def isqrt(self, n):
+        return int(gmpy2.isqrt(n))
+
+
+BACKENDS = {
+    "python": PythonBackend,
+    "native": NativeBackend,
+    "gmpy2": Gmpy2Backend,
+}
+
+
+def available_backends():
+    """Names of the backends usable in this environment."""
+    return [name for name in BACKENDS if name != "gmpy2" or gmpy2 is not None]
+
+
+def get_backend(name=None):
+    """
+    Returns a backend instance by name.
+    name=None picks the fastest available: gmpy2 if installed, else native.
+    """
+    if name is None:
+        name = "gmpy2" if gmpy2 is not None else "native"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown big-integer backend: {name}")
+    if name == "gmpy2" and gmpy2 is None:
+        raise ValueError("gmpy2 backend requested but gmpy2 is not installed")
+    return BACKENDS[name]()
@@ -1,7 +1,47 @@
+import os
+import mmap
+import time
+import heapq
 import string
 from ai_recommender import AIRecommender
+from utils import ordered_pool_map
+from metrics import STAGE_SECONDS, ATTACK_SECONDS, CANDIDATES_SCORED
+
+# Translation tables, built once per shift (0-25) and shared by every CaesarCipher
+_STR_TABLES = {}
+_BYTES_TABLES = {}
+
+def _shifted_alphabet(shift):
+    shift %= 26
+    upper = string.ascii_uppercase
+    lower = string.ascii_lowercase
+    return upper + lower, upper[shift:] + upper[:shift] + lower[shift:] + lower[:shift]
+
+def _str_table(shift):
+    """str.translate() table shifting ASCII letters by shift; everything else is left alone."""
+    shift %= 26
+    table = _STR_TABLES.get(shift)
+    if table is None:
+        table = _STR_TABLES[shift] = str.maketrans(*_shifted_alphabet(shift))
+    return table
+
+def _bytes_table(shift):
+    """bytes.translate() table, same mapping. UTF-8 multi-byte sequences never contain ASCII letters, so they pass through."""
+    shift %= 26
+    table = _BYTES_TABLES.get(shift)
+    if table is None:
+        src, dst = _shifted_alphabet(shift)
+        table = _BYTES_TABLES[shift] = bytes.maketrans(src.encode('ascii'), dst.encode('ascii'))
+    return table
+
 
 class CaesarCipher:
+    """
+    Table-driven Caesar cipher. Accepts str, bytes or bytearray (the result
+    has the same type). Only ASCII letters are shifted; case is preserved.
+    """
+    MMAP_THRESHOLD = 4 * 1024 * 1024 # Files at least this large are mmapped by encrypt_file()/decrypt_file()
+
     def __init__(self, shift=0):
         self.shift = shift
         self.upper_alpha = string.ascii_uppercase
@@ -9,50 +49,196 @@ class CaesarCipher:
         self.modulus = 26
 
     def _shift_char(self, char, shift_amount):
-        if char in self.upper_alpha:
-            idx = self.upper_alpha.index(char)
-            return self.upper_alpha[(idx + shift_amount) % self.modulus]
-        elif char in self.lower_alpha:
-            idx = self.lower_alpha.index(char)
-            return self.lower_alpha[(idx + shift_amount) % self.modulus]
-        else:
-            return char
+        return char.translate(_str_table(shift_amount))
+
+    def _translate(self, text, shift):
+        if isinstance(text, (bytes, bytearray)):
+            return text.translate(_bytes_table(shift))
+        return text.translate(_str_table(shift))
 
     def encrypt(self, plaintext, key=None):
         shift = key if key is not None else self.shift
-        return ''.join(self._shift_char(c, shift) for c in plaintext)
+        return self._translate(plaintext, shift)
 
+    @STAGE_SECONDS.time(stage="caesar_decrypt")
     def decrypt(self, ciphertext, key=None):
         shift = key if key is not None else self.shift
-        return ''.join(self._shift_char(c, -shift) for c in ciphertext)
+        return self._translate(ciphertext, -shift)
+
+    def _stream(self, in_stream, out_stream, shift, chunk_size):
+        """
+        Shifts a binary stream in fixed-size chunks (constant memory).
+        in_stream: file-like with readinto() (files, BytesIO, socket.makefile('rb'))
+        or a socket (recv_into()). out_stream: file-like with write() or a socket.
+        Returns: Number of bytes written.
+        """
+        table = _bytes_table(shift)
+        buf = bytearray(chunk_size)
+        read = in_stream.readinto if hasattr(in_stream, 'readinto') else in_stream.recv_into
+        write = out_stream.write if hasattr(out_stream, 'write') else out_stream.sendall
+        total = 0
+        while True:
+            count = read(buf)
+            if not count:
+                break
+            write(buf[:count].translate(table) if count < chunk_size else buf.translate(table))
+            total += count
+        return total
+
+    def encrypt_stream(self, in_stream, out_stream, key=None, chunk_size=1024 * 1024):
+        shift = key if key is not None else self.shift
+        return self._stream(in_stream, out_stream, shift, chunk_size)
+
+    def decrypt_stream(self, in_stream, out_stream, key=None, chunk_size=1024 * 1024):
+        shift = key if key is not None else self.shift
+        return self._stream(in_stream, out_stream, -shift, chunk_size)
+
+    def _file(self, in_path, out_path, shift, chunk_size):
+        with open(in_path, 'rb') as fin, open(out_path, 'wb') as fout:
+            size = os.fstat(fin.fileno()).st_size
+            if not size or size < self.MMAP_THRESHOLD:
+                return self._stream(fin, fout, shift, chunk_size)
+            # Big files: slice the mapping directly instead of copying into a read buffer
+            table = _bytes_table(shift)
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, size, chunk_size):
+                    fout.write(mm[offset:offset + chunk_size].translate(table))
+            return size
+
+    def encrypt_file(self, in_path, out_path, key=None, chunk_size=1024 * 1024):
+        """Encrypts the file at in_path into out_path in chunks. Returns bytes written."""
+        shift = key if key is not None else self.shift
+        return self._file(in_path, out_path, shift, chunk_size)
+
+    def decrypt_file(self, in_path, out_path, key=None, chunk_size=1024 * 1024):
+        """Decrypts the file at in_path into out_path in chunks. Returns bytes written."""
+        shift = key if key is not None else self.shift
+        return self._file(in_path, out_path, -shift, chunk_size)
 
 
 class CaesarAttacker:
     def __init__(self):
         self.cipher = CaesarCipher()
         self.ai = AIRecommender()
+        self.SAMPLING_THRESHOLD = 4096 # Longer ciphertexts are ranked on sampled windows first (0 = never)
 
-    def attack(self, ciphertext):
+    def attack_iter(self, ciphertext, top_n=5, deadline=None):
+        """
+        Generator version of attack().
+        Yields "candidate" events for each new best key, a "progress" event
+        after every key, and a final "done" event with the ranked results.
+        deadline: optional time.monotonic() value; remaining keys are skipped
+        once it passes and "done" is sent with complete=False.
+        Ciphertexts of SAMPLING_THRESHOLD chars or more are first ranked with
+        AIRecommender.score_sampled(); when the windows settle the ranking,
+        candidates carry the window score and skip full-text scoring. The
+        deadline is also checked while decrypting and sampling; if it passes
+        there, the ranking of the windows scored so far is sent with complete=False.
+        """
         candidates = []
+        best_score = -1.0
+        complete = True
+        start = time.perf_counter()
         print(f"\n[AI] Analyzing 26 possible candidates for: '{ciphertext[:20]}...'")
+
+        texts = None
+        sampled = None
+        if self.SAMPLING_THRESHOLD and len(ciphertext) >= self.SAMPLING_THRESHOLD:
+            texts = {}
+            for key in range(26):
+                if deadline is not None and time.monotonic() > deadline:
+                    complete = False
+                    break
+                texts[key] = self.cipher.decrypt(ciphertext, key)
+            if complete:
+                sampled, windows = self.ai.score_sampled(texts, deadline=deadline)
+                if deadline is not None and time.monotonic() > deadline:
+                    complete = False
+                    print(f"[AI] Deadline passed while sampling, ranking on {windows} windows.")
+                elif sampled is not None:
+                    print(f"[AI] Sampled scoring settled the ranking after {windows} windows.")
+                else:
+                    print("[AI] Sampled scoring was inconclusive, scoring full texts.")
+
         for key in range(26):
-            decrypted_text = self.cipher.decrypt(ciphertext, key)
-            analysis = self.ai.analyze(decrypted_text)
+            # Sampled candidates need no further scoring, so they are all reported
+            if sampled is None and deadline is not None and time.monotonic() > deadline:
+                complete = False
+                break
+            decrypted_text = texts[key] if texts else self.cipher.decrypt(ciphertext, key)
+            if sampled is not None:
+                analysis = {
+                    "score": sampled[key],
+                    "log_prob": 0,
+                    "details": [f"Sampled Score: {sampled[key]:.4f} (mean of {windows} windows)"],
+                    "segmented": False,
+                    "auto_correct": [],
+                    "sampled": True
+                }
+            else:
+                analysis = self.ai.analyze(decrypted_text)
             
-            # Auto-correct if score is decent
+            # Auto-correct if score is decent (a full-text pass, so not for sampled candidates)
             corrections = []
-            if analysis['score'] > 0.6:
+            if analysis['score'] > 0.6 and sampled is None:
                 corrected_text, corrections = self.ai.auto_correct(decrypted_text)
                 if corrections:
                     decrypted_text = corrected_text
                     # Re-score? Optional.
             
-            candidates.append({
+            candidate = {
                 "key": key,
                 "plaintext": decrypted_text,
                 "score": analysis['score'],
                 "details": analysis,
                 "corrections": corrections
-            })
+            }
+            candidates.append(candidate)
+            CANDIDATES_SCORED.inc(attack="caesar")
+            if candidate['score'] > best_score:
+                best_score = candidate['score']
+                yield {"event": "candidate", "candidate": candidate}
+            yield {
+                "event": "progress",
+                "done": key + 1,
+                "total": 26,
+                "top": heapq.nlargest(top_n, candidates, key=lambda x: x['score'])
+            }
         candidates.sort(key=lambda x: x['score'], reverse=True)
-        return candidates
+        ATTACK_SECONDS.observe(time.perf_counter() - start, attack="caesar")
+        yield {"event": "done", "results": candidates, "complete": complete}
+
+    def attack(self, ciphertext, progress=None, deadline=None):
+        """
+        Tries all 26 shifts and ranks them with the AI scorer.
+        progress: optional callback(done, total, top) called after each key.
+        deadline: optional time.monotonic() value; returns the best-so-far ranking when it passes.
+        """
+        for event in self.attack_iter(ciphertext, deadline=deadline):
+            if event["event"] == "progress" and progress:
+                progress(event["done"], event["total"], event["top"])
+            elif event["event"] == "done":
+                return event["results"]
+
+    def attack_many(self, ciphertexts, workers=None, top_n=5, time_budget=None):
+        """
+        Attacks many ciphertexts, spread across processes.
+        ciphertexts may be any iterable (consumed lazily).
+        time_budget: optional seconds allowed per ciphertext (best-so-far when exceeded).
+        Yields the top_n results for each ciphertext, in input order.
+        """
+        workers = workers or os.cpu_count() or 1
+        args = ((text, top_n, time_budget) for text in ciphertexts)
+        return ordered_pool_map(_attack_worker, args, workers, initializer=_init_worker)
+
+
+# Per-process attacker for attack_many() (built once per worker, not per message)
+_worker_attacker = None
+
+def _init_worker():
+    global _worker_attacker
+    _worker_attacker = CaesarAttacker()
+
+def _attack_worker(text, top_n, time_budget=None):
+    deadline = time.monotonic() + time_budget if time_budget else None
+    return _worker_attacker.attack(text, deadline=deadline)[:top_n]
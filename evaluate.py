@@ -0,0 +1,212 @@
+"""
+Accuracy vs. throughput evaluation for the attackers.
+Builds a labelled corpus from words.txt (varied lengths, spaced and
+unspaced), encrypts it with random Caesar shifts, transposition keys and
+both combined, runs the attackers and reports per length bucket:
+success rate (true key ranked first), mean rank of the true key and
+candidates scored per second.
+Run: python evaluate.py [--samples N] [--modes caesar,transposition,combined] [--json FILE]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import time
+
+from caesar_cipher import CaesarCipher, CaesarAttacker
+from transposition_cipher import TranspositionCipher, TranspositionAttacker
+from utils import ordered_pool_map
+
+MODES = ("caesar", "transposition", "combined")
+LENGTH_BUCKETS = (16, 32, 64, 128)
+VOCABULARY_SIZE = 2000 # most frequent words of words.txt
+
+
+def load_vocabulary(path="words.txt", size=VOCABULARY_SIZE):
+    with open(path, 'r', encoding='utf-8') as f:
+        words = [w.strip().lower() for w in f if w.strip().isalpha()]
+    return words[:size]
+
+
+def make_plaintext(rng, vocabulary, length, spaces=True):
+    """Random words until the text reaches `length` characters (trimmed to it)."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + (1 if spaces else 0)
+    return (' ' if spaces else '').join(words)[:length]
+
+
+def build_corpus(samples=3, modes=MODES, buckets=LENGTH_BUCKETS, seed=1234, max_key_len=8):
+    """
+    Labelled samples: one dict per (mode, length, spacing, sample) with the
+    plaintext, ciphertext and the true shift / column order.
+    Transposition keys are random column orders of 2..max_key_len columns.
+    """
+    rng = random.Random(seed)
+    vocabulary = load_vocabulary()
+    caesar = CaesarCipher()
+    trans = TranspositionCipher()
+    corpus = []
+    for mode in modes:
+        for length in buckets:
+            for spaces in (True, False):
+                for _ in range(samples):
+                    plaintext = make_plaintext(rng, vocabulary, length, spaces)
+                    shift = rng.randrange(1, 26) if mode != "transposition" else None
+                    order = None
+                    if mode != "caesar":
+                        order = list(range(rng.randint(2, min(max_key_len, length - 1))))
+                        rng.shuffle(order)
+                    ciphertext = plaintext
+                    if shift is not None:
+                        ciphertext = caesar.encrypt(ciphertext, shift)
+                    if order is not None:
+                        ciphertext = trans.encrypt(ciphertext, order)
+                    corpus.append({
+                        "mode": mode,
+                        "length": length,
+                        "spaces": spaces,
+                        "plaintext": plaintext,
+                        "ciphertext": ciphertext,
+                        "shift": shift,
+                        "order": order,
+                    })
+    return corpus
+
+
+def _drain(events):
+    """Consumes an attack_iter() generator. Returns (results, candidates scored)."""
+    scored = 0
+    for event in events:
+        if event["event"] == "progress":
+            scored = event["done"]
+        elif event["event"] == "done":
+            return event["results"], scored
+    return [], scored
+
+
+def _rank(results, is_true):
+    """1-based rank of the first result matching the truth, or None."""
+    for i, result in enumerate(results):
+        if is_true(result):
+            return i + 1
+    return None
+
+
+# Per-process attackers (built once per worker, not per sample)
+_attackers = {}
+
+def _init_worker():
+    _attackers["caesar"] = CaesarAttacker()
+    _attackers["transposition"] = TranspositionAttacker()
+
+
+def evaluate_sample(sample, time_budget=None):
+    """
+    Attacks one labelled sample. Returns the sample's labels plus
+    rank (None if the truth is not among the returned candidates),
+    candidates scored and elapsed seconds.
+    Transposition matches on key or plaintext (different column orders can
+    decrypt to the same text); combined mode first ranks column orders by
+    Caesar potential, then runs the Caesar attack on the best one.
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    plaintext = sample["plaintext"]
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if sample["mode"] == "caesar":
+            results, scored = _drain(_attackers["caesar"].attack_iter(sample["ciphertext"],
+                                                                      deadline=deadline))
+            rank = _rank(results, lambda r: r["key"] == sample["shift"])
+        else:
+            order_key = f"Len {len(sample['order'])} | {sample['order']}"
+            check_caesar = sample["mode"] == "combined"
+            results, scored = _drain(_attackers["transposition"].attack_iter(
+                sample["ciphertext"], check_caesar, deadline=deadline))
+            if not check_caesar:
+                rank = _rank(results, lambda r: r["key"] == order_key or r["plaintext"] == plaintext)
+            else:
+                shifted = CaesarCipher().encrypt(plaintext, sample["shift"])
+                rank = _rank(results, lambda r: r["key"] == order_key or r["plaintext"] == shifted)
+                if rank == 1:
+                    # Second stage: the shift must be recovered too for a full success
+                    caesar_results, caesar_scored = _drain(
+                        _attackers["caesar"].attack_iter(results[0]["plaintext"], deadline=deadline))
+                    scored += caesar_scored
+                    if _rank(caesar_results, lambda r: r["key"] == sample["shift"]) != 1:
+                        rank = None
+    return {
+        "mode": sample["mode"],
+        "length": sample["length"],
+        "spaces": sample["spaces"],
+        "rank": rank,
+        "scored": scored,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize(rows):
+    """Groups sample results by (mode, spacing, length)."""
+    groups = {}
+    for row in rows:
+        key = (row["mode"], "spaced" if row["spaces"] else "unspaced", row["length"])
+        groups.setdefault(key, []).append(row)
+
+    report = []
+    for (mode, spacing, length), group in sorted(groups.items()):
+        found = [r["rank"] for r in group if r["rank"] is not None]
+        seconds = sum(r["seconds"] for r in group)
+        report.append({
+            "mode": mode,
+            "spacing": spacing,
+            "length": length,
+            "samples": len(group),
+            "success_rate": sum(1 for r in found if r == 1) / len(group),
+            "mean_rank": sum(found) / len(found) if found else None,
+            "not_found": len(group) - len(found),
+            "candidates_per_sec": sum(r["scored"] for r in group) / seconds if seconds else 0.0,
+        })
+    return report
+
+
+def print_report(report):
+    print(f"{'mode':<15}{'spacing':<10}{'length':>7}{'n':>4}{'success':>9}{'rank':>7}{'miss':>6}{'cand/s':>10}")
+    for row in report:
+        rank = f"{row['mean_rank']:.1f}" if row['mean_rank'] is not None else '-'
+        print(f"{row['mode']:<15}{row['spacing']:<10}{row['length']:>7}{row['samples']:>4}"
+              f"{row['success_rate']:>8.0%} {rank:>6}{row['not_found']:>6}{row['candidates_per_sec']:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure attack accuracy against throughput.")
+    parser.add_argument("--samples", type=int, default=3, help="samples per mode, length and spacing")
+    parser.add_argument("--modes", default=','.join(MODES), help=f"comma-separated: {', '.join(MODES)}")
+    parser.add_argument("--lengths", default=','.join(map(str, LENGTH_BUCKETS)), help="plaintext lengths")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--time-budget", type=float,
+                        help="seconds per attack (best-so-far ranking after that); combined mode "
+                             "needs ~30-60s per sample to search every column order")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--json", help="write per-bucket results to this JSON file")
+    args = parser.parse_args()
+
+    modes = args.modes.split(',')
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    corpus = build_corpus(args.samples, modes, [int(n) for n in args.lengths.split(',')], args.seed)
+    print(f"[Eval] {len(corpus)} samples, {args.jobs} worker(s)")
+    rows = list(ordered_pool_map(evaluate_sample, ((s, args.time_budget) for s in corpus),
+                                 args.jobs, initializer=_init_worker))
+    report = summarize(rows)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"seed": args.seed, "samples": args.samples, "buckets": report}, f, indent=2)
+        print(f"[Eval] Results saved to {args.json}")
@@ -0,0 +1,112 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+    pass
+
+
+class Job:
+    """
+    One background attack.
+    The worker thread updates progress/results; request threads read them via to_dict().
+    """
+    def __init__(self, job_type, top_n=5):
+        self.id = uuid.uuid4().hex
+        self.type = job_type
+        self.status = "queued" # queued -> running -> done | failed
+        self.progress = 0.0
+        self.results = []
+        self.result = None # Final payload (set when done)
+        self.error = None
+        self.top_n = top_n
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def update(self, done, total, top):
+        """Progress callback for the attackers: (done, total, best candidates so far)."""
+        with self._lock:
+            self.progress = done / total if total else 0.0
+            self.results = list(top[:self.top_n])
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "type": self.type,
+                "status": self.status,
+                "progress": round(self.progress, 4),
+                "results": list(self.results),
+                "result": self.result,
+                "error": self.error,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+            }
+
+
+class JobManager:
+    """
+    Runs attack jobs on a bounded thread pool.
+    max_workers caps concurrent attacks; max_pending caps queued + running jobs
+    (submit() raises QueueFullError beyond that). Finished jobs are kept for
+    retention seconds so clients can poll the result.
+    The thread pool is started on the first submit(), so a manager created
+    before a pre-forking server forks has no threads to lose in the children.
+    """
+    def __init__(self, max_workers=2, max_pending=32, retention=600):
+        self.max_workers = max_workers
+        self.executor = None
+        self.max_pending = max_pending
+        self.retention = retention
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def _purge(self):
+        cutoff = time.time() - self.retention
+        for job_id in [j.id for j in self.jobs.values() if j.finished and j.finished < cutoff]:
+            del self.jobs[job_id]
+
+    def submit(self, job_type, target, *args):
+        """
+        Queues target(job, *args). target returns the final result payload
+        and may call job.update() for progress. Returns the Job.
+        """
+        job = Job(job_type)
+        with self._lock:
+            self._purge()
+            active = sum(1 for j in self.jobs.values() if j.status in ("queued", "running"))
+            if active >= self.max_pending:
+                raise QueueFullError(f"Too many pending jobs ({active})")
+            self.jobs[job.id] = job
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="attack-job")
+        self.executor.submit(self._run, job, target, args)
+        return job
+
+    def _run(self, job, target, args):
+        with job._lock:
+            job.status = "running"
+            job.started = time.time()
+        try:
+            result = target(job, *args)
+            with job._lock:
+                job.result = result
+                job.progress = 1.0
+                job.status = "done"
+        except Exception as e:
+            with job._lock:
+                job.error = str(e)
+                job.status = "failed"
+        finally:
+            with job._lock:
+                job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
@@ -1,6 +1,13 @@
 import os
+import sys
+import hashlib
+
+# Bump when the scoring logic changes in a way that alters results
+# (file changes are picked up automatically by FrequencyLoader.version).
+MODEL_REVISION = 1
 
 class FrequencyLoader:
+    """Loads the n-gram and spelling models. Progress goes to stderr so stdout stays clean for piped output."""
     def __init__(self, base_path="."):
         self.base_path = base_path
         self.unigrams = {}
@@ -17,10 +24,24 @@ class FrequencyLoader:
         self.edit_dist_probs = {}
         
         self.top_words = set()
+        self.loaded_files = [] # Paths actually loaded (used for the model version)
 
         # Load resources
         self.load_standard_resources()
         self.load_spelling_resources()
+        self.version = self._compute_version()
+
+    def _compute_version(self):
+        """
+        Fingerprint of the loaded language model: name, size and mtime of each
+        resource file. Changes whenever a frequency file is added, removed or edited,
+        so caches keyed on it are invalidated automatically.
+        """
+        h = hashlib.sha256(f"rev{MODEL_REVISION};".encode('utf-8'))
+        for path in sorted(self.loaded_files):
+            st = os.stat(path)
+            h.update(f"{os.path.basename(path)}:{st.st_size}:{int(st.st_mtime)};".encode('utf-8'))
+        return h.hexdigest()[:16]
 
     def load_standard_resources(self, low_mem=False):
         # 1. Unigrams
@@ -28,7 +49,8 @@ class FrequencyLoader:
         path = os.path.join(self.base_path, filename)
         
         if os.path.exists(path):
-            print(f"Loading Unigrams from {filename}...")
+            print(f"Loading Unigrams from {filename}...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     parts = line.strip().split('\t')
@@ -42,12 +64,13 @@ class FrequencyLoader:
             sorted_words = sorted(self.unigrams.items(), key=lambda x: x[1], reverse=True)
             self.top_words = {w for w, c in sorted_words[:5000]}
         else:
-            print(f"[Warning] Unigram file not found: {path}")
+            print(f"[Warning] Unigram file not found: {path}", file=sys.stderr)
 
         # 2. Bigrams
         path = os.path.join(self.base_path, "count_2.txt")
         if os.path.exists(path):
-            print("Loading Bigrams (Optimized)...")
+            print("Loading Bigrams (Optimized)...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     parts = line.strip().split('\t')
@@ -62,12 +85,13 @@ class FrequencyLoader:
                                     self.bigrams[w1] = {}
                                 self.bigrams[w1][w2] = int(count)
         else:
-            print(f"[Warning] Bigram file not found: {path}")
+            print(f"[Warning] Bigram file not found: {path}", file=sys.stderr)
 
         # 3. Char Trigrams
         path = os.path.join(self.base_path, "count_3l.txt")
         if os.path.exists(path):
-            print("Loading Character Trigrams...")
+            print("Loading Character Trigrams...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     parts = line.strip().split('\t')
@@ -80,7 +104,8 @@ class FrequencyLoader:
         # 4. Char Bigrams
         path = os.path.join(self.base_path, "count_2l.txt")
         if os.path.exists(path):
-            print("Loading Character Bigrams...")
+            print("Loading Character Bigrams...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     parts = line.strip().split('\t')
@@ -94,7 +119,8 @@ class FrequencyLoader:
         # 5. Char Quadgrams (RECOMMENDED FOR TRANSPOSITION)
         path = os.path.join(self.base_path, "english_quadgrams.txt")
         if os.path.exists(path):
-            print("Loading Character Quadgrams...")
+            print("Loading Character Quadgrams...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     parts = line.strip().split() # Usually split by space
@@ -104,13 +130,14 @@ class FrequencyLoader:
                         self.quadgrams[quad] = count
                         self.total_quadgrams += count
         else:
-             print(f"[Warning] Quadgram file not found: {path} (Skipping Classical Scoring)")
+             print(f"[Warning] Quadgram file not found: {path} (Skipping Classical Scoring)", file=sys.stderr)
 
     def load_spelling_resources(self):
         # 1. Spell Errors
         path = os.path.join(self.base_path, "spell_errors.txt")
         if os.path.exists(path):
-            print("Loading Spell Errors...")
+            print("Loading Spell Errors...", file=sys.stderr)
+            self.loaded_files.append(path)
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
                     # Format: "correct: wrong1, wrong2"
@@ -125,7 +152,7 @@ class FrequencyLoader:
         # 2. Edit Distance Probs
         path = os.path.join(self.base_path, "count_edit.txt")
         if os.path.exists(path):
-            print("Loading Edit Distance Probabilities...")
+            print("Loading Edit Distance Probabilities...", file=sys.stderr)
             # Format might vary, assuming simple key-value for now or just loading it
             # For this task, we might not strictly need the probabilities if we use the lookup table
             # But let's load it if we need sophisticated correction later.
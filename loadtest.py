@@ -0,0 +1,238 @@
+"""
+Load test for the web API.
+Starts the app on a local port (or targets --url), fires a weighted mix of
+Caesar, transposition and RSA requests from concurrent clients and reports
+throughput and latency percentiles per route.
+Run: python loadtest.py [--clients N] [--duration S] [--save FILE] [--compare FILE]
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from caesar_cipher import CaesarCipher
+from transposition_cipher import TranspositionCipher
+from rsa_cipher import RSACipher
+
+# Route -> relative weight in the request mix
+DEFAULT_MIX = {
+    'caesar_encrypt': 20,
+    'caesar_decrypt': 20,
+    'caesar_attack': 10,
+    'transposition_encrypt': 15,
+    'transposition_decrypt': 15,
+    'transposition_attack': 1,
+    'rsa_encrypt': 10,
+    'rsa_decrypt': 10,
+    'rsa_attack': 2,
+}
+
+SAMPLE_TEXTS = [
+    "the quick brown fox jumps over the lazy dog",
+    "meet me at the usual place at ten rather than eight",
+    "attack at dawn",
+    "security is a process not a product",
+]
+
+
+def build_requests(seed=1234):
+    """
+    Builds the (path, JSON body) pair for every route in DEFAULT_MIX from
+    fixed seeds, so runs against different versions send identical traffic.
+    """
+    random.seed(seed)
+    caesar = CaesarCipher()
+    trans = TranspositionCipher()
+    rsa = RSACipher()
+    pub, priv = rsa.generate_keys(keysize=32) # weak on purpose, attackable quickly
+    text = SAMPLE_TEXTS[0]
+    short = "attackat" # kept short: the transposition brute force takes seconds even at 8 chars
+    rsa_cipher = rsa.format_ciphertext(rsa.encrypt(text, pub), pub[1])
+
+    return {
+        'caesar_encrypt': ('/api/caesar/encrypt', {'text': text, 'shift': 3}),
+        'caesar_decrypt': ('/api/caesar/decrypt', {'text': caesar.encrypt(text, 3), 'shift': 3}),
+        'caesar_attack': ('/api/caesar/attack', {'text': caesar.encrypt(text, 11)}),
+        'transposition_encrypt': ('/api/transposition/encrypt', {'text': text, 'key': 'KEY'}),
+        'transposition_decrypt': ('/api/transposition/decrypt', {'text': trans.encrypt(text, 'KEY'), 'key': 'KEY'}),
+        'transposition_attack': ('/api/transposition/attack', {'text': trans.encrypt(short, 'BAC')}),
+        'rsa_encrypt': ('/api/rsa/encrypt', {'text': text, 'e': str(pub[0]), 'n': str(pub[1])}),
+        'rsa_decrypt': ('/api/rsa/decrypt', {'text': rsa_cipher, 'd': str(priv[0]), 'n': str(priv[1])}),
+        'rsa_attack': ('/api/rsa/attack', {'text': rsa_cipher, 'e': str(pub[0]), 'n': str(pub[1])}),
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _post(url, body, timeout):
+    """Sends one JSON POST. Returns the HTTP status (0 on connection errors)."""
+    req = urllib.request.Request(url, data=json.dumps(body).encode('utf-8'),
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as err:
+        err.read()
+        return err.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def run_load(base_url, clients=8, duration=10.0, mix=None, seed=1234, timeout=30.0):
+    """
+    Runs `clients` threads for `duration` seconds, each picking routes by the
+    mix weights. Returns (wall_seconds, {route: [(latency, status), ...]}).
+    """
+    mix = mix or DEFAULT_MIX
+    requests = build_requests(seed)
+    routes = [r for r in mix if mix[r] > 0]
+    weights = [mix[r] for r in routes]
+    samples = {route: [] for route in routes}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(client_id):
+        rng = random.Random(seed + client_id)
+        while time.monotonic() < stop_at:
+            route = rng.choices(routes, weights)[0]
+            path, body = requests[route]
+            start = time.perf_counter()
+            status = _post(base_url + path, body, timeout)
+            latency = time.perf_counter() - start
+            with lock:
+                samples[route].append((latency, status))
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, samples
+
+
+def summarize(wall, samples):
+    """Per-route throughput, error count and latency percentiles (milliseconds)."""
+    report = {}
+    for route, rows in samples.items():
+        if not rows:
+            continue
+        latencies = sorted(lat for lat, _ in rows)
+        errors = sum(1 for _, status in rows if status != 200)
+        report[route] = {
+            'requests': len(rows),
+            'errors': errors,
+            'rps': len(rows) / wall,
+            'mean_ms': 1000 * sum(latencies) / len(latencies),
+            'p50_ms': 1000 * percentile(latencies, 50),
+            'p95_ms': 1000 * percentile(latencies, 95),
+            'p99_ms': 1000 * percentile(latencies, 99),
+        }
+    return report
+
+
+def print_report(report):
+    print(f"{'route':<24}{'reqs':>7}{'errs':>6}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for route, row in sorted(report.items()):
+        print(f"{route:<24}{row['requests']:>7}{row['errors']:>6}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms{row['p99_ms']:>8.1f}ms")
+
+
+def compare(report, baseline, tolerance=0.2):
+    """
+    Prints p50/p95/p99 and throughput changes against a saved baseline.
+    Returns the list of routes that regressed by more than tolerance (fraction).
+    """
+    regressed = []
+    print(f"{'route':<24}{'metric':>8}{'baseline':>12}{'current':>12}{'change':>9}")
+    for route, row in sorted(report.items()):
+        base = baseline.get(route)
+        if base is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'rps'):
+            old, new = base[metric], row[metric]
+            change = (new - old) / old if old else 0.0
+            # Latency regresses upwards, throughput downwards
+            worse = change > tolerance if metric != 'rps' else change < -tolerance
+            flag = '  <-- regression' if worse else ''
+            print(f"{route:<24}{metric:>8}{old:>12.2f}{new:>12.2f}{change:>+8.0%}{flag}")
+            if worse and route not in regressed:
+                regressed.append(route)
+    return regressed
+
+
+def start_local_server(port=0):
+    """Serves create_app() on a background thread. Returns (server, base_url)."""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR) # no per-request access log
+    app = create_app({'METRICS_ENABLED': False})
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _parse_mix(text):
+    """'caesar_attack=5,rsa_encrypt=1' -> weights (routes not listed keep their default)."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, text.split(',')):
+        route, weight = item.split('=')
+        if route not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown route: {route}")
+        mix[route] = int(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the web API.")
+    parser.add_argument("--url", help="target a running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="route weights, e.g. caesar_attack=5,transposition_attack=0")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--save", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="compare against a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative change counted as a regression (default 0.2)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, base_url = start_local_server()
+    print(f"[Load] {args.clients} clients for {args.duration}s against {base_url}")
+
+    try:
+        wall, samples = run_load(base_url, args.clients, args.duration, args.mix, args.seed)
+    finally:
+        if server:
+            server.shutdown()
+
+    report = summarize(wall, samples)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'clients': args.clients, 'duration': args.duration, 'routes': report}, f, indent=2)
+        print(f"[Load] Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressed = compare(report, baseline['routes'], args.tolerance)
+        if regressed:
+            print(f"[Load] Regressions: {', '.join(regressed)}")
+            raise SystemExit(1)
@@ -1,9 +1,15 @@
 import sys
+import json
+import argparse
+import contextlib
 import traceback
+from collections import deque
+from ai_recommender import AIRecommender
 from caesar_cipher import CaesarCipher, CaesarAttacker
 from transposition_cipher import TranspositionCipher, TranspositionAttacker
-from rsa_cipher import RSACipher, RSAAttacker
-from utils import print_separator, print_results
+from rsa_cipher import RSACipher, RSAAttacker, BatchGCDAttacker
+from utils import print_separator, print_results, ordered_pool_map
+from profiling import PROFILE_MODES, profile_call
 
 def main():
     try:
@@ -14,6 +20,7 @@ def main():
         trans_cracker = TranspositionAttacker()
         rsa = RSACipher()
         rsa_cracker = RSAAttacker()
+        batch_gcd = BatchGCDAttacker()
 
         # State for RSA Keys (to simulate a session)
         current_public_key = None
@@ -88,6 +95,9 @@ def main():
                 print("2. Encrypt (Public Key)")
                 print("3. Decrypt (Private Key)")
                 print("4. Attack (Brute Force Factorization)")
+                print("5. Batch GCD Scan (File of Public Keys)")
+                print("6. Encrypt File (Parallel)")
+                print("7. Decrypt File (Parallel)")
                 sub = input("Choice: ").strip()
 
                 if sub == '1':
@@ -112,13 +122,17 @@ def main():
                         e = int(input("Enter e: "))
                         n = int(input("Enter n: "))
                     
+                    fmt = input("Output format (decimal/base64) [decimal]: ").strip().lower() or 'decimal'
                     cipher_ints = rsa.encrypt(txt, (e, n))
-                    print(f"Ciphertext (space-separated ints): {' '.join(map(str, cipher_ints))}")
+                    try:
+                        print(f"Ciphertext ({fmt}): {rsa.format_ciphertext(cipher_ints, n, fmt)}")
+                    except ValueError as err:
+                        print(f"Invalid format: {err}")
 
                 elif sub == '3':
-                    cipher_str = input("Ciphertext (space-separated ints): ")
+                    cipher_str = input("Ciphertext (space-separated ints or base64): ")
                     try:
-                        cipher_ints = list(map(int, cipher_str.strip().split()))
+                        cipher_ints = rsa.parse_ciphertext(cipher_str)
                         
                         if current_private_key:
                             use_stored = input(f"Use stored private key {current_private_key}? (y/n): ").lower()
@@ -133,21 +147,25 @@ def main():
 
                         print(f"Result: {rsa.decrypt(cipher_ints, (d, n))}")
                     except ValueError:
-                        print("Invalid input. Ciphertext must be integers.")
+                        print("Invalid input. Ciphertext must be integers or base64.")
 
                 elif sub == '4':
                     print("To attack, you need the Public Key (e, n) and the Ciphertext.")
                     e = int(input("Enter e: "))
                     n = int(input("Enter n: "))
-                    cipher_str = input("Ciphertext (space-separated ints): ")
+                    cipher_str = input("Ciphertext (space-separated ints or base64): ")
+                    portfolio = input("Race all strategies in parallel? (y/N): ").strip().lower() == 'y'
                     
                     try:
-                        cipher_ints = list(map(int, cipher_str.strip().split()))
+                        cipher_ints = rsa.parse_ciphertext(cipher_str)
                         
                         # 1. Recover Private Key
-                        result = rsa_cracker.attack((e, n))
+                        if portfolio:
+                            result = rsa_cracker.attack_portfolio((e, n))
+                        else:
+                            result = rsa_cracker.attack((e, n))
                         
-                        if result:
+                        if result and result['private_key']:
                             # 2. Decrypt
                             # result is now a dict: {'private_key': (d, n), 'details': ...}
                             recovered_key = result['private_key']
@@ -164,6 +182,41 @@ def main():
                     except ValueError:
                         print("Invalid input.")
 
+                elif sub == '5':
+                    path = input("Key file (one 'n' or 'e n' per line): ").strip()
+                    try:
+                        broken = batch_gcd.scan_file(path)
+                    except (OSError, ValueError) as err:
+                        print(f"Could not scan file: {err}")
+                        continue
+
+                    if not broken:
+                        print("\n[RESULT] No shared primes found.")
+                    for r in broken:
+                        d, n = r['private_key']
+                        print(f"Key #{r['index']}: shares a prime with {r['shares_with']}")
+                        print(f"  Private Key (d, n): ({d}, {n})")
+
+                elif sub in ('6', '7'):
+                    in_path = input("Input file: ").strip()
+                    out_path = input("Output file: ").strip()
+                    stored = current_public_key if sub == '6' else current_private_key
+                    exp_name = 'e' if sub == '6' else 'd'
+                    try:
+                        if stored and input(f"Use stored key {stored}? (y/n): ").lower() == 'y':
+                            key = stored
+                        else:
+                            key = (int(input(f"Enter {exp_name}: ")), int(input("Enter n: ")))
+                        if sub == '6':
+                            fmt = input("Output format (decimal/binary) [decimal]: ").strip().lower() or 'decimal'
+                            count = rsa.encrypt_file(in_path, out_path, key, fmt=fmt)
+                            print(f"Encrypted {count} blocks -> {out_path}")
+                        else:
+                            count = rsa.decrypt_file(in_path, out_path, key)
+                            print(f"Decrypted {count} bytes -> {out_path}")
+                    except (OSError, ValueError) as err:
+                        print(f"File operation failed: {err}")
+
             elif main_choice == '4':
                 break
             else:
@@ -173,5 +226,211 @@ def main():
         print("\nCRITICAL ERROR:")
         traceback.print_exc()
 
+# --- BATCH CLI ---
+# Non-interactive subcommands: one message per input line, one JSON object per output line.
+
+def _read_lines(paths):
+    """Yields the non-empty lines of each file ('-' is stdin), without the newline."""
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        try:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if line.strip():
+                    yield line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+# Per-process tools for the rsa/analyze workers (built once per worker, not per message)
+_cli_tools = {}
+
+def _init_cli_worker():
+    _cli_tools['rsa'] = RSACipher()
+    _cli_tools['rsa_attacker'] = RSAAttacker()
+    _cli_tools['ai'] = AIRecommender()
+
+def _rsa_encrypt_line(text, key, fmt):
+    rsa = _cli_tools['rsa']
+    return {'ciphertext': rsa.format_ciphertext(rsa.encrypt(text, key), key[1], fmt)}
+
+def _rsa_decrypt_line(text, key):
+    rsa = _cli_tools['rsa']
+    return {'plaintext': rsa.decrypt(rsa.parse_ciphertext(text), key)}
+
+def _rsa_attack_line(text, key, portfolio=False):
+    rsa = _cli_tools['rsa']
+    cipher_ints = rsa.parse_ciphertext(text)
+    # Every line shares the key, so each worker factors n only once
+    recovered = _cli_tools.setdefault('recovered', {})
+    if key not in recovered:
+        attacker = _cli_tools['rsa_attacker']
+        recovered[key] = attacker.attack_portfolio(key) if portfolio else attacker.attack(key)
+    result = recovered[key]
+    record = {'method': result['method'], 'timings': result['timings']} if portfolio else {}
+    if not result or not result['private_key']:
+        return dict(record, success=False)
+    return dict(
+        record,
+        success=True,
+        private_key=list(result['private_key']),
+        plaintext=rsa.decrypt(cipher_ints, result['private_key']),
+        details=result['details'],
+    )
+
+def _analyze_line(text):
+    return _cli_tools['ai'].analyze(text)
+
+def _safe_call(func, text, *args):
+    """Runs one line's work; errors become part of the record instead of stopping the batch."""
+    try:
+        return func(text, *args)
+    except Exception as e:
+        return {'error': str(e)}
+
+def _cli_records(args, lines):
+    """Yields one result dict per input line, in input order."""
+    if args.cipher == 'caesar':
+        for results in CaesarAttacker().attack_many(lines, workers=args.jobs, top_n=args.top,
+                                                    time_budget=args.time_budget):
+            yield {'results': results}
+    elif args.cipher == 'transposition':
+        for results, summary in TranspositionAttacker().attack_many(lines, check_caesar=args.check_caesar,
+                                                                    workers=args.jobs, top_n=args.top,
+                                                                    time_budget=args.time_budget,
+                                                                    stop_early=args.stop_early,
+                                                                    checkpoint_dir=args.checkpoint_dir,
+                                                                    key_range=args.key_range,
+                                                                    keywords=args.keywords,
+                                                                    with_summary=True):
+            yield dict(summary, results=results)
+    elif args.cipher == 'analyze':
+        yield from ordered_pool_map(_safe_call, ((_analyze_line, text) for text in lines),
+                                    args.jobs, initializer=_init_cli_worker)
+    elif args.action == 'encrypt':
+        work = ((_rsa_encrypt_line, text, (args.e, args.n), args.format) for text in lines)
+        yield from ordered_pool_map(_safe_call, work, args.jobs, initializer=_init_cli_worker)
+    elif args.action == 'decrypt':
+        work = ((_rsa_decrypt_line, text, (args.d, args.n)) for text in lines)
+        yield from ordered_pool_map(_safe_call, work, args.jobs, initializer=_init_cli_worker)
+    elif args.action == 'attack':
+        work = ((_rsa_attack_line, text, (args.e, args.n), args.portfolio) for text in lines)
+        yield from ordered_pool_map(_safe_call, work, args.jobs, initializer=_init_cli_worker)
+
+def _key_range(text):
+    """'START:STOP' -> (start, stop)."""
+    try:
+        start, stop = (int(x) for x in text.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START:STOP, got {text!r}")
+    if not 0 <= start < stop:
+        raise argparse.ArgumentTypeError(f"need 0 <= START < STOP, got {text!r}")
+    return start, stop
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description='Batch mode. Reads one message per line from files or stdin and writes JSON Lines. '
+                    'Run without arguments for the interactive menu.'
+    )
+    sub = parser.add_subparsers(dest='cipher', required=True)
+
+    def add_profile(p):
+        p.add_argument('--profile', choices=PROFILE_MODES,
+                       help='profile the run (in-process, --jobs is ignored) and save it under --profile-dir')
+        p.add_argument('--profile-dir', default='profiles', help='where profiles are written')
+
+    def add_io(p):
+        p.add_argument('inputs', nargs='*', default=['-'], help="input files ('-' or none = stdin)")
+        p.add_argument('-o', '--output', default='-', help="output file ('-' = stdout)")
+        p.add_argument('--jobs', type=int, default=1, help='worker processes')
+        add_profile(p)
+
+    def add_attack(p):
+        add_io(p)
+        p.add_argument('--top', type=int, default=5, help='candidates kept per message')
+        p.add_argument('--time-budget', type=float, help='seconds allowed per message (best-so-far after)')
+
+    caesar = sub.add_parser('caesar', help='Caesar cipher').add_subparsers(dest='action', required=True)
+    add_attack(caesar.add_parser('attack', help='rank all 26 shifts of each line'))
+
+    trans = sub.add_parser('transposition', help='Columnar transposition').add_subparsers(dest='action', required=True)
+    p = trans.add_parser('attack', help='brute force the column order of each line')
+    add_attack(p)
+    p.add_argument('--check-caesar', action='store_true', help='also try Caesar shifts of each candidate')
+    p.add_argument('--stop-early', action='store_true',
+                   help='stop searching longer keys once a confident match is found')
+    p.add_argument('--keywords', action='store_true',
+                   help='try only column orders of dictionary keywords (key lengths up to 15)')
+    p.add_argument('--checkpoint-dir', help='save progress per line here and resume from it')
+    p.add_argument('--key-range', type=_key_range, metavar='START:STOP',
+                   help='search only this slice of the keyspace (to split a search across machines)')
+
+    rsa = sub.add_parser('rsa', help='RSA').add_subparsers(dest='action', required=True)
+    p = rsa.add_parser('keygen', help='generate key pairs')
+    p.add_argument('--bits', type=int, default=1024)
+    p.add_argument('--count', type=int, default=1)
+    p.add_argument('-o', '--output', default='-', help="output file ('-' = stdout)")
+    add_profile(p)
+    p = rsa.add_parser('encrypt', help='encrypt each line')
+    add_io(p)
+    p.add_argument('-e', type=int, required=True)
+    p.add_argument('-n', type=int, required=True)
+    p.add_argument('--format', choices=['decimal', 'base64'], default='decimal')
+    p = rsa.add_parser('decrypt', help='decrypt each line (decimal or base64)')
+    add_io(p)
+    p.add_argument('-d', type=int, required=True)
+    p.add_argument('-n', type=int, required=True)
+    p = rsa.add_parser('attack', help='factor n, then decrypt each line')
+    add_io(p)
+    p.add_argument('-e', type=int, required=True)
+    p.add_argument('-n', type=int, required=True)
+    p.add_argument('--portfolio', action='store_true',
+                   help='race all factoring strategies in parallel, each with its own time budget')
+
+    add_io(sub.add_parser('analyze', help='score each line as English'))
+    return parser
+
+def _run_command(args, out):
+    if args.cipher == 'rsa' and args.action == 'keygen':
+        rsa = RSACipher()
+        for _ in range(args.count):
+            pub, priv = rsa.generate_keys(keysize=args.bits)
+            out.write(json.dumps({'public': list(pub), 'private': list(priv)}) + '\n')
+        return
+
+    # Inputs read but not yet written (bounded by the pool's in-flight window)
+    pending = deque()
+    def remember(lines):
+        for text in lines:
+            pending.append(text)
+            yield text
+    records = _cli_records(args, remember(_read_lines(args.inputs)))
+    for i, record in enumerate(records):
+        out.write(json.dumps({'line': i + 1, 'input': pending.popleft(), **record}) + '\n')
+        out.flush()
+
+def run_cli(argv):
+    """Entry point of the batch mode. Returns the exit code."""
+    args = _build_parser().parse_args(argv)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        # Progress chatter from the attackers goes to stderr; stdout only carries JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.profile:
+                # Worker processes would escape the profiler, so profile in-process
+                if getattr(args, 'jobs', 1) > 1:
+                    args.jobs = 1
+                _, path = profile_call(_run_command, args, out, mode=args.profile, out_dir=args.profile_dir)
+                print(f"[Profile] Saved {path}")
+            else:
+                _run_command(args, out)
+        return 0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
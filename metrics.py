@@ -0,0 +1,146 @@
+import functools
+import threading
+import time
+
+# Latency buckets (seconds) shared by every histogram
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class Counter:
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, registry, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.values = {} # label key -> [bucket counts..., sum, count]
+
+    def observe(self, seconds, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        with self.registry.lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    row[i] += 1
+            row[-2] += seconds
+            row[-1] += 1
+
+    def time(self, **labels):
+        """Decorator recording the wrapped function's latency (skipped when disabled)."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.registry.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, row in sorted(self.values.items()):
+            # observe() increments every bound >= value, so counts are already cumulative
+            for i, bound in enumerate(self.buckets):
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {row[i]}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {row[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {row[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {row[-1]}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+    def __init__(self, registry, name, help_text, callback):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+
+    def expose(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.callback()}"]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics with Prometheus text exposition.
+    Disabled by default: every record call returns after one flag check.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def counter(self, name, help_text):
+        return self.metrics.setdefault(name, Counter(self, name, help_text))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(self, name, help_text, buckets))
+
+    def gauge(self, name, help_text, callback):
+        self.metrics[name] = Gauge(self, name, help_text, callback)
+        return self.metrics[name]
+
+    def expose(self):
+        """Returns all metrics in Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                if isinstance(metric, Gauge):
+                    continue
+                lines.extend(metric.expose())
+        # Gauge callbacks may take their own locks, so run them outside ours
+        for metric in list(self.metrics.values()):
+            if isinstance(metric, Gauge):
+                lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+# Global registry and the metrics recorded by the attackers / AI scorer
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram("crypto_stage_seconds", "Latency of each decrypt/scoring stage.")
+ATTACK_SECONDS = registry.histogram("crypto_attack_seconds", "Latency of a full attack.")
+CANDIDATES_SCORED = registry.counter("crypto_candidates_scored_total", "Candidate plaintexts scored.")
+CANDIDATES_PRUNED = registry.counter(
+    "crypto_candidates_pruned_total", "Candidates rejected by a cheap filter before full scoring."
+)
+CACHE_LOOKUPS = registry.counter("crypto_cache_lookups_total", "Attack result cache lookups by outcome.")
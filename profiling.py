@@ -0,0 +1,86 @@
+import os
+import re
+import sys
+import uuid
+import cProfile
+import threading
+
+PROFILE_MODES = ("cprofile", "sample")
+
+_SAFE_ID = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+def new_profile_id(requested=None):
+    """Returns requested if it is safe to use in a file name, else a fresh random ID."""
+    if requested and _SAFE_ID.match(requested) and requested not in ('.', '..'):
+        return requested
+    return uuid.uuid4().hex[:12]
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread records the stack of one
+    target thread every `interval` seconds. Much lower overhead than
+    cProfile on long attacks; output is in collapsed-stack format
+    ("outer;inner;leaf count" per line) for flamegraph.pl or speedscope.
+    """
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                stack = ';'.join(reversed(names))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+def profile_call(func, *args, mode="cprofile", out_dir="profiles", profile_id=None, **kwargs):
+    """
+    Runs func(*args, **kwargs) under a profiler and saves the profile as
+    <out_dir>/<profile_id>.pstats (cprofile) or .collapsed (sample).
+    The profile is written even if func raises.
+    Returns (func's result, path of the saved profile).
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (use {' or '.join(PROFILE_MODES)})")
+    profile_id = new_profile_id(profile_id)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if mode == "cprofile":
+        path = os.path.join(out_dir, f"{profile_id}.pstats")
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs), path
+        finally:
+            profiler.dump_stats(path)
+
+    path = os.path.join(out_dir, f"{profile_id}.collapsed")
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        return func(*args, **kwargs), path
+    finally:
+        profiler.stop()
+        with open(path, 'w') as f:
+            f.write(profiler.collapsed())
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from metrics import CACHE_LOOKUPS
+
+
+class ResultCache:
+    """
+    Two-level cache for attack results.
+    Level 1: in-process LRU (max_entries). Level 2: optional SQLite file (db_path).
+    Keys combine the attack type, its parameters and a SHA-256 digest of the
+    ciphertext, plus the language model version, so results computed with an
+    older model are never served. Values must be JSON-serializable.
+    The SQLite connection is opened lazily per process, so a cache created
+    before the server forks is safe to use in every worker.
+    """
+    def __init__(self, model_version, max_entries=256, db_path=None):
+        self.model_version = model_version
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.memory = OrderedDict() # key -> serialized JSON
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+
+    @property
+    def db(self):
+        """This process's SQLite connection (None without db_path)."""
+        if not self.db_path:
+            return None
+        if self._db_pid != os.getpid():
+            # Never reuse a connection inherited across fork()
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db_pid = os.getpid()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, model_version TEXT, value TEXT)"
+            )
+            # Drop everything computed with another model version
+            self._db.execute("DELETE FROM results WHERE model_version != ?", (self.model_version,))
+            self._db.commit()
+        return self._db
+
+    def make_key(self, kind, params, text):
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        param_str = json.dumps(params, sort_keys=True)
+        return f"{self.model_version}:{kind}:{param_str}:{digest}"
+
+    def _remember(self, key, value):
+        """Inserts into the LRU, evicting the oldest entries. Caller holds the lock."""
+        if key in self.memory:
+            self.memory_bytes -= len(self.memory.pop(key))
+        self.memory[key] = value
+        self.memory_bytes += len(value)
+        while len(self.memory) > self.max_entries:
+            _, old = self.memory.popitem(last=False)
+            self.memory_bytes -= len(old)
+
+    def get(self, kind, params, text):
+        """Returns the cached result or None."""
+        key = self.make_key(kind, params, text)
+        with self._lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                CACHE_LOOKUPS.inc(result="hit", level="memory")
+                return json.loads(value)
+            if self.db is not None:
+                row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    CACHE_LOOKUPS.inc(result="hit", level="disk")
+                    return json.loads(row[0])
+            self.misses += 1
+            CACHE_LOOKUPS.inc(result="miss", level="all")
+            return None
+
+    def put(self, kind, params, text, result):
+        key = self.make_key(kind, params, text)
+        value = json.dumps(result)
+        with self._lock:
+            self._remember(key, value)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results (key, model_version, value) VALUES (?, ?, ?)",
+                    (key, self.model_version, value)
+                )
+                self.db.commit()
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+            if self.db is not None:
+                self.db.execute("DELETE FROM results")
+                self.db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_entries = 0
+            disk_bytes = 0
+            if self.db is not None:
+                disk_entries, disk_bytes = self.db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM results"
+                ).fetchone()
+            return {
+                "model_version": self.model_version,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
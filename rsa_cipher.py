@@ -1,35 +1,108 @@
+import os
+import base64
+import binascii
 import random
 import math
+import time
+import multiprocessing
+from queue import Empty
+from bigint import get_backend
+from utils import ordered_pool_map
+from metrics import ATTACK_SECONDS
+
+# Compact binary ciphertext container: magic + uint16 block width + fixed-width blocks
+CIPHERTEXT_MAGIC = b'RSA1'
+CIPHERTEXT_HEADER_SIZE = len(CIPHERTEXT_MAGIC) + 2
+
+def _rsa_block_size(n):
+    """Plaintext bytes per block for modulus n (one byte less than n, minimum 1)."""
+    key_bytes = (n.bit_length() + 7) // 8
+    return max(1, key_bytes - 1)
+
+
+def _encrypt_chunk(data, e, n, backend_name=None):
+    """Encrypts a run of whole blocks (bytes). Returns the list of cipher ints."""
+    powmod = get_backend(backend_name).powmod
+    block_size = _rsa_block_size(n)
+    return [
+        powmod(int.from_bytes(data[i : i + block_size], byteorder='big'), e, n)
+        for i in range(0, len(data), block_size)
+    ]
+
+
+def _decrypt_chunk(cipher_ints, d, n, backend_name=None):
+    """
+    Decrypts a list of cipher ints. Returns the plaintext bytes, every block
+    restored to its full width (leading zero bytes included).
+    """
+    powmod = get_backend(backend_name).powmod
+    block_size = _rsa_block_size(n)
+    out = bytearray()
+    for cipher_int in cipher_ints:
+        plain_int = powmod(cipher_int, d, n)
+        try:
+            out.extend(plain_int.to_bytes(block_size, byteorder='big'))
+        except OverflowError:
+            raise ValueError("Decrypted block is too large (wrong key?)")
+    return bytes(out)
+
+
+def _pad(data, block_size):
+    """
+    ISO/IEC 7816-4 padding: 0x80 then zeros up to a whole number of blocks.
+    Always adds at least one byte, so the length of the short last block is recoverable.
+    """
+    return data + b'\x80' + b'\x00' * (-(len(data) + 1) % block_size)
+
+
+def _unpad(data, block_size):
+    """Strips _pad() padding from the end of the plaintext."""
+    stripped = data.rstrip(b'\x00')
+    if not stripped.endswith(b'\x80') or len(data) - len(stripped) >= block_size:
+        raise ValueError("Bad padding (wrong key, or not written by encrypt_stream())")
+    return stripped[:-1]
+
+
+def _read_int_tokens(f, chunk_size=1 << 16, prefix=b''):
+    """
+    Yields whitespace-separated ints from a binary stream without reading it all.
+    prefix: bytes already consumed from the stream (e.g. while sniffing the format).
+    """
+    carry = prefix
+    while True:
+        buf = f.read(chunk_size)
+        if not buf:
+            break
+        buf = carry + buf
+        tokens = buf.split()
+        # The last token may continue in the next read
+        if tokens and not buf[-1:].isspace():
+            carry = tokens.pop()
+        else:
+            carry = b''
+        for tok in tokens:
+            yield int(tok)
+    if carry.strip():
+        yield int(carry)
+
+
+def _unpack_blocks(view, width):
+    """Splits a memoryview of fixed-width big-endian blocks into ints."""
+    if width == 0 or len(view) % width:
+        raise ValueError("Truncated RSA binary ciphertext")
+    return [int.from_bytes(view[i : i + width], byteorder='big') for i in range(0, len(view), width)]
+
 
 class RSACipher:
-    def __init__(self):
-        pass
+    def __init__(self, backend=None):
+        # Big-integer backend: 'gmpy2', 'native' or 'python' (None = fastest available)
+        self.backend = get_backend(backend)
 
     def gcd(self, a, b):
-        while b != 0:
-            a, b = b, a % b
-        return a
+        return self.backend.gcd(a, b)
 
     def mod_inverse(self, a, m):
-        m0 = m
-        y = 0
-        x = 1
-        if m == 1:
-            return 0
-        while a > 1:
-            # q is quotient
-            q = a // m
-            t = m
-            # m is remainder now, process same as Euclid's algo
-            m = a % m
-            a = t
-            t = y
-            # Update y and x
-            y = x - q * y
-            x = t
-        if x < 0:
-            x += m0
-        return x
+        return self.backend.mod_inverse(a, m)
 
     def _is_prime_miller_rabin(self, n, k=40):
         """
@@ -47,11 +120,11 @@ class RSACipher:
 
         for _ in range(k):
             a = random.randrange(2, n - 1)
-            x = pow(a, d, n)
+            x = self.backend.powmod(a, d, n)
             if x == 1 or x == n - 1:
                 continue
             for _ in range(r - 1):
-                x = pow(x, 2, n)
+                x = self.backend.powmod(x, 2, n)
                 if x == n - 1:
                     break
             else:
@@ -128,7 +201,7 @@ class RSACipher:
             # Convert block to int
             block_int = int.from_bytes(block, byteorder='big')
             # Encrypt
-            cipher_int = pow(block_int, e, n)
+            cipher_int = self.backend.powmod(block_int, e, n)
             encrypted_blocks.append(cipher_int)
 
         return encrypted_blocks
@@ -149,7 +222,7 @@ class RSACipher:
         
         for cipher_int in ciphertext:
             # Decrypt
-            plain_int = pow(cipher_int, d, n)
+            plain_int = self.backend.powmod(cipher_int, d, n)
             # Convert back to bytes
             # Length? It should be at most key_bytes - 1
             # But we can just use enough bytes to represent the int
@@ -175,10 +248,171 @@ class RSACipher:
 
         return decrypted_bytes.decode('utf-8', errors='ignore')
 
+    def pack_ciphertext(self, cipher_ints, n):
+        """
+        Packs cipher ints into the compact binary container:
+        b'RSA1' | block width in bytes (uint16, big-endian) | fixed-width big-endian blocks.
+        Every block is as wide as the modulus, so no separators are needed.
+        """
+        width = (n.bit_length() + 7) // 8
+        out = bytearray(CIPHERTEXT_MAGIC)
+        out += width.to_bytes(2, byteorder='big')
+        for cipher_int in cipher_ints:
+            out += cipher_int.to_bytes(width, byteorder='big')
+        return bytes(out)
+
+    def unpack_ciphertext(self, data):
+        """
+        Parses the binary container produced by pack_ciphertext().
+        Returns: List of cipher ints.
+        """
+        view = memoryview(data)
+        if bytes(view[:len(CIPHERTEXT_MAGIC)]) != CIPHERTEXT_MAGIC:
+            raise ValueError("Not an RSA binary ciphertext (bad header)")
+        width = int.from_bytes(view[len(CIPHERTEXT_MAGIC):CIPHERTEXT_HEADER_SIZE], byteorder='big')
+        return _unpack_blocks(view[CIPHERTEXT_HEADER_SIZE:], width)
+
+    def format_ciphertext(self, cipher_ints, n, fmt='decimal'):
+        """
+        Serializes cipher ints for transport.
+        fmt: 'decimal' (legacy, space-separated ints) or 'base64' (binary container).
+        """
+        if fmt == 'decimal':
+            return ' '.join(map(str, cipher_ints))
+        if fmt == 'base64':
+            return base64.b64encode(self.pack_ciphertext(cipher_ints, n)).decode('ascii')
+        raise ValueError(f"Unknown ciphertext format: {fmt}")
+
+    def parse_ciphertext(self, text):
+        """
+        Parses ciphertext in either format.
+        All-digit input is the legacy space-separated decimal format;
+        anything else is treated as the base64 binary container.
+        Returns: List of cipher ints.
+        """
+        tokens = text.split()
+        if all(tok.isdigit() for tok in tokens):
+            return list(map(int, tokens))
+        try:
+            data = base64.b64decode(''.join(tokens), validate=True)
+        except binascii.Error:
+            raise ValueError("Ciphertext is neither space-separated ints nor base64")
+        return self.unpack_ciphertext(data)
+
+    def encrypt_stream(self, in_stream, out_stream, key, workers=None, chunk_blocks=256, fmt='decimal'):
+        """
+        Encrypts a binary input stream block by block on a process pool.
+        Blocks are read and written incrementally (chunk_blocks blocks per task),
+        so memory stays flat however large the input is.
+        The input is padded (see _pad()) so arbitrary binary data, leading
+        zero bytes included, round-trips exactly through decrypt_stream().
+        fmt: 'decimal' (space-separated ints, same as encrypt()) or
+        'binary' (the pack_ciphertext() container, written as it grows).
+        Returns: Number of blocks written.
+        """
+        e, n = key
+        workers = workers or os.cpu_count() or 1
+        block_size = _rsa_block_size(n)
+        chunk_bytes = block_size * chunk_blocks
+        width = (n.bit_length() + 7) // 8
+
+        def chunks():
+            # Read one chunk ahead so the last one can be padded
+            data = in_stream.read(chunk_bytes)
+            while True:
+                following = in_stream.read(chunk_bytes)
+                if not following:
+                    yield (_pad(data, block_size), e, n, self.backend.name)
+                    return
+                yield (data, e, n, self.backend.name)
+                data = following
+
+        if fmt == 'binary':
+            out_stream.write(CIPHERTEXT_MAGIC + width.to_bytes(2, byteorder='big'))
+        elif fmt != 'decimal':
+            raise ValueError(f"Unknown stream format: {fmt}")
+
+        total = 0
+        for cipher_ints in ordered_pool_map(_encrypt_chunk, chunks(), workers):
+            if fmt == 'binary':
+                out_stream.write(b''.join(c.to_bytes(width, byteorder='big') for c in cipher_ints))
+            else:
+                if total:
+                    out_stream.write(b' ')
+                out_stream.write(' '.join(map(str, cipher_ints)).encode('ascii'))
+            total += len(cipher_ints)
+        return total
+
+    def decrypt_stream(self, in_stream, out_stream, key, workers=None, chunk_blocks=256):
+        """
+        Decrypts a binary input stream on a process pool.
+        The format is detected from the first bytes: the binary container
+        or legacy space-separated decimal ints.
+        Plaintext bytes are written to out_stream as each chunk finishes (the
+        last chunk is held back until the padding has been stripped).
+        Raises ValueError if the padding is missing (wrong key, or input not
+        written by encrypt_stream()).
+        Returns: Number of plaintext bytes written.
+        """
+        d, n = key
+        workers = workers or os.cpu_count() or 1
+        head = in_stream.read(len(CIPHERTEXT_MAGIC))
+
+        def binary_chunks():
+            width = int.from_bytes(in_stream.read(2), byteorder='big')
+            while True:
+                data = in_stream.read(width * chunk_blocks)
+                if not data:
+                    break
+                yield (_unpack_blocks(memoryview(data), width), d, n, self.backend.name)
+
+        def decimal_chunks():
+            batch = []
+            for cipher_int in _read_int_tokens(in_stream, prefix=head):
+                batch.append(cipher_int)
+                if len(batch) == chunk_blocks:
+                    yield (batch, d, n, self.backend.name)
+                    batch = []
+            if batch:
+                yield (batch, d, n, self.backend.name)
+
+        chunks = binary_chunks() if head == CIPHERTEXT_MAGIC else decimal_chunks()
+        total = 0
+        pending = None
+        for plain in ordered_pool_map(_decrypt_chunk, chunks, workers):
+            if pending is not None:
+                out_stream.write(pending)
+                total += len(pending)
+            pending = plain
+        if pending is None:
+            raise ValueError("Empty RSA ciphertext")
+        pending = _unpad(pending, _rsa_block_size(n))
+        out_stream.write(pending)
+        return total + len(pending)
+
+    def encrypt_file(self, in_path, out_path, key, workers=None, chunk_blocks=256, fmt='decimal'):
+        """Encrypts the file at in_path into out_path. See encrypt_stream()."""
+        with open(in_path, 'rb') as fin, open(out_path, 'wb') as fout:
+            return self.encrypt_stream(fin, fout, key, workers, chunk_blocks, fmt)
+
+    def decrypt_file(self, in_path, out_path, key, workers=None, chunk_blocks=256):
+        """Decrypts the file at in_path into out_path. See decrypt_stream()."""
+        with open(in_path, 'rb') as fin, open(out_path, 'wb') as fout:
+            return self.decrypt_stream(fin, fout, key, workers, chunk_blocks)
+
 
 class RSAAttacker:
-    def __init__(self):
-        self.rsa = RSACipher()
+    # Default per-strategy time budgets (seconds) for attack_portfolio()
+    PORTFOLIO_BUDGETS = {
+        "trial_division": 2.0,
+        "fermat": 2.0,
+        "wiener": 1.0,
+        "pollard_rho": 10.0,
+        "pollard_p_minus_1": 5.0,
+    }
+
+    def __init__(self, backend=None):
+        self.rsa = RSACipher(backend)
 
     def _pollards_rho(self, n):
         """
@@ -203,10 +437,164 @@ class RSAAttacker:
                 
         return g
 
-    def attack(self, public_key):
+    def _out_of_time(self, deadline):
+        return deadline is not None and time.monotonic() > deadline
+
+    def _trial_division_wheel(self, n, deadline=None):
+        """
+        Trial division with a mod-30 wheel.
+        Skips every multiple of 2, 3 and 5 (only 8 of each 30 candidates are tried).
+        """
+        for p in (2, 3, 5):
+            if n % p == 0:
+                return p
+
+        limit = self.rsa.backend.isqrt(n)
+        increments = [4, 2, 4, 2, 4, 6, 2, 6] # 7, 11, 13, 17, 19, 23, 29, 31, ...
+        i = 7
+        k = 0
+        checks = 0
+        while i <= limit:
+            if n % i == 0:
+                return i
+            i += increments[k]
+            k = (k + 1) & 7
+            checks += 1
+            if checks % 100000 == 0 and self._out_of_time(deadline):
+                return None
+        return None
+
+    def _fermat(self, n, deadline=None):
+        """
+        Fermat's factorization method.
+        Finds p and q almost instantly when they are close to sqrt(n).
+        """
+        if n % 2 == 0:
+            return 2
+
+        isqrt = self.rsa.backend.isqrt
+        a = isqrt(n)
+        if a * a < n:
+            a += 1
+        # If p = 3 is the smallest factor, a never needs to exceed (n + 9) / 6
+        limit = (n + 9) // 6
+        checks = 0
+        while a <= limit:
+            b2 = a * a - n
+            b = isqrt(b2)
+            if b * b == b2:
+                p = a - b
+                return p if p > 1 else None
+            a += 1
+            checks += 1
+            if checks % 10000 == 0 and self._out_of_time(deadline):
+                return None
+        return None
+
+    def _wiener(self, e, n, deadline=None):
+        """
+        Wiener's continued-fraction attack.
+        Recovers the factors when d < n^(1/4) / 3 by testing the convergents k/d of e/n.
+        """
+        # Continued fraction expansion of e / n
+        num, den = e, n
+        h_prev, h = 0, 1 # numerators (k)
+        k_prev, k = 1, 0 # denominators (d)
+        while den:
+            a = num // den
+            num, den = den, num - a * den
+            h_prev, h = h, a * h + h_prev
+            k_prev, k = k, a * k + k_prev
+
+            cand_k, cand_d = h, k
+            if cand_k == 0 or (e * cand_d - 1) % cand_k != 0:
+                continue
+            phi = (e * cand_d - 1) // cand_k
+            # p and q are the roots of x^2 - (n - phi + 1)x + n
+            s = n - phi + 1
+            disc = s * s - 4 * n
+            if disc >= 0:
+                root = self.rsa.backend.isqrt(disc)
+                if root * root == disc:
+                    p = (s + root) // 2
+                    if 1 < p < n and n % p == 0:
+                        return p
+            if self._out_of_time(deadline):
+                return None
+        return None
+
+    def _pollards_rho_iterative(self, n, deadline=None):
+        """
+        Pollard's Rho without recursion.
+        Restarts with new random parameters until a factor is found or the deadline passes.
+        """
+        if n % 2 == 0:
+            return 2
+
+        while not self._out_of_time(deadline):
+            x = random.randint(2, n - 1)
+            y = x
+            c = random.randint(1, n - 1)
+            g = 1
+            steps = 0
+            while g == 1:
+                x = (x * x + c) % n
+                y = (y * y + c) % n
+                y = (y * y + c) % n
+                g = self.rsa.gcd(abs(x - y), n)
+                steps += 1
+                if steps % 1000 == 0 and self._out_of_time(deadline):
+                    return None
+            if g != n:
+                return g
+        return None
+
+    def _pollard_p_minus_1(self, n, deadline=None, bound=1000000):
+        """
+        Pollard's p-1 method.
+        Finds p quickly when p-1 has only small prime factors (smooth).
+        """
+        if n % 2 == 0:
+            return 2
+
+        a = 2
+        for j in range(2, bound):
+            a = self.rsa.backend.powmod(a, j, n)
+            if j % 1000 == 0:
+                g = self.rsa.gcd(a - 1, n)
+                if 1 < g < n:
+                    return g
+                if g == n:
+                    # Overshot: every factor became smooth at once
+                    return None
+                if self._out_of_time(deadline):
+                    return None
+        g = self.rsa.gcd(a - 1, n)
+        if 1 < g < n:
+            return g
+        return None
+
+    def run_strategy(self, method, public_key, deadline=None):
+        """Runs one named factoring strategy. Returns a non-trivial factor of n or None."""
+        e, n = public_key
+        if method == "trial_division":
+            return self._trial_division_wheel(n, deadline)
+        if method == "fermat":
+            return self._fermat(n, deadline)
+        if method == "wiener":
+            return self._wiener(e, n, deadline)
+        if method == "pollard_rho":
+            return self._pollards_rho_iterative(n, deadline)
+        if method == "pollard_p_minus_1":
+            return self._pollard_p_minus_1(n, deadline)
+        raise ValueError(f"Unknown strategy: {method}")
+
+    @ATTACK_SECONDS.time(attack="rsa")
+    def attack(self, public_key, deadline=None):
         """
         Attempts to recover private key from public key (e, n).
         Uses Trial Division for small n, Pollard's Rho for medium n.
+        deadline: optional time.monotonic() value; the search gives up (returns None) when it passes.
         """
         e, n = public_key
         print(f"[RSA Attack] Attacking n={n} ({n.bit_length()} bits)...")
@@ -232,8 +620,10 @@ class RSAAttacker:
         elif n.bit_length() <= 64:
             print("[RSA Attack] Using Pollard's Rho...")
             try:
-                # Set a timeout/limit logic if needed, but for <64 bits it's usually fast.
-                p = self._pollards_rho(n)
+                if deadline is not None:
+                    p = self._pollards_rho_iterative(n, deadline)
+                else:
+                    p = self._pollards_rho(n)
             except RecursionError:
                 print("[RSA Attack] Pollard's Rho failed (recursion depth).")
         
@@ -266,3 +656,262 @@ class RSAAttacker:
         except Exception as e:
             print(f"[RSA Attack] Error calculating d: {e}")
             return None
+
+
+    def _private_key_from_factor(self, e, n, p):
+        """Builds the attack result dict from one factor p of n."""
+        q = n // p
+        phi = (p - 1) * (q - 1)
+        d = self.rsa.mod_inverse(e, phi)
+        return {
+            "private_key": (d, n),
+            "details": {
+                "p": p,
+                "q": q,
+                "phi": phi,
+                "d": d
+            }
+        }
+
+    def attack_portfolio(self, public_key, budgets=None, deadline=None):
+        """
+        Runs several factoring strategies in parallel processes.
+        Each strategy gets its own time budget (seconds). The first one to find
+        a factor wins and the others are cancelled.
+        deadline: optional time.monotonic() value; budgets are cut to the time left.
+        Returns: Same dict as attack() plus 'method' (winner or None) and
+        'timings' ({method: {'status', 'seconds'}}). 'private_key' is None on failure.
+        """
+        e, n = public_key
+        budgets = dict(budgets or self.PORTFOLIO_BUDGETS)
+        if deadline is not None:
+            left = max(0.0, deadline - time.monotonic())
+            budgets = {method: min(budget, left) for method, budget in budgets.items()}
+        print(f"[RSA Attack] Portfolio attack on n={n} ({n.bit_length()} bits): {', '.join(budgets)}")
+
+        queue = multiprocessing.Queue()
+        workers = {}
+        started = {}
+        for method, budget in budgets.items():
+            proc = multiprocessing.Process(
+                target=_portfolio_worker,
+                args=(method, public_key, budget, queue, self.rsa.backend.name),
+                daemon=True
+            )
+            proc.start()
+            workers[method] = proc
+            started[method] = time.monotonic()
+
+        timings = {}
+        winner = None
+        factor = None
+        # Grace period so a worker that just hit its deadline can still report back
+        grace = 0.5
+        while len(timings) < len(workers):
+            pending = [m for m in workers if m not in timings]
+            now = time.monotonic()
+            wait = max(0.0, min(started[m] + budgets[m] + grace for m in pending) - now)
+            try:
+                method, p, seconds = queue.get(timeout=wait)
+            except Empty:
+                # Every pending worker past its budget + grace is timed out
+                now = time.monotonic()
+                for m in pending:
+                    if now >= started[m] + budgets[m] + grace:
+                        workers[m].terminate()
+                        timings[m] = {"status": "timeout", "seconds": now - started[m]}
+                continue
+
+            if p and 1 < p < n and n % p == 0:
+                timings[method] = {"status": "success", "seconds": seconds}
+                winner = method
+                factor = p
+                break
+            timings[method] = {"status": "failed", "seconds": seconds}
+
+        # Cancel the rest
+        now = time.monotonic()
+        for m, proc in workers.items():
+            if m not in timings:
+                timings[m] = {"status": "cancelled", "seconds": now - started[m]}
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+        for m, t in timings.items():
+            print(f"[RSA Attack]   {m:<18} {t['status']:<9} {t['seconds']:.3f}s")
+
+        if winner is None:
+            print("[RSA Attack] Portfolio failed to find factors.")
+            return {"private_key": None, "details": None, "method": None, "timings": timings}
+
+        print(f"[RSA Attack] {winner} found p={factor}")
+        result = self._private_key_from_factor(e, n, factor)
+        result["method"] = winner
+        result["timings"] = timings
+        return result
+
+
+def _portfolio_worker(method, public_key, budget, queue, backend_name=None):
+    """Process entry point for attack_portfolio(). Reports (method, factor, seconds)."""
+    attacker = RSAAttacker(backend_name)
+    start = time.monotonic()
+    try:
+        p = attacker.run_strategy(method, public_key, deadline=start + budget)
+    except Exception:
+        p = None
+    queue.put((method, p, time.monotonic() - start))
+
+
+class BatchGCDAttacker:
+    """
+    Bernstein's batch GCD over a large set of RSA moduli.
+    Finds every modulus that shares a prime factor with another modulus
+    in the set, using a product tree and a remainder tree.
+
+    To keep memory bounded for 100k+ keys the moduli are split into chunks.
+    Only the product of each chunk is kept (plus a small tree over those
+    products), and the full product tree of the chunk currently being reduced.
+    Tree arithmetic uses the backend's big() integers: with gmpy2 this is
+    quasi-linear; plain Python ints divide in quadratic time.
+    """
+    def __init__(self, chunk_size=2048, default_e=65537, backend=None):
+        self.rsa = RSACipher(backend)
+        self.chunk_size = chunk_size
+        self.default_e = default_e
+
+    def load_keys(self, path):
+        """
+        Reads public keys from a file, one per line.
+        Accepted line formats: "n", "e n" or "e,n" (decimal or 0x-prefixed hex).
+        Blank lines and lines starting with '#' are skipped.
+        Returns: List of (e, n) tuples.
+        """
+        keys = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                parts = line.replace(',', ' ').split()
+                values = [int(p, 0) for p in parts]
+                if len(values) == 1:
+                    keys.append((self.default_e, values[0]))
+                else:
+                    keys.append((values[0], values[1]))
+        return keys
+
+    def _product_tree(self, values):
+        """Returns the product tree as a list of levels (leaves first, root last)."""
+        tree = [[self.rsa.backend.big(v) for v in values]]
+        while len(tree[-1]) > 1:
+            level = tree[-1]
+            next_level = []
+            for i in range(0, len(level), 2):
+                if i + 1 < len(level):
+                    next_level.append(level[i] * level[i + 1])
+                else:
+                    next_level.append(level[i])
+            tree.append(next_level)
+        return tree
+
+    def _remainder_tree(self, value, tree):
+        """
+        Pushes value down the product tree.
+        Returns value mod n^2 for every leaf n.
+        """
+        remainders = [value % (tree[-1][0] ** 2)]
+        for level in reversed(tree[:-1]):
+            remainders = [remainders[i // 2] % (level[i] ** 2) for i in range(len(level))]
+        return remainders
+
+    def _chunks(self, moduli):
+        for start in range(0, len(moduli), self.chunk_size):
+            yield moduli[start : start + self.chunk_size]
+
+    def batch_gcd(self, moduli):
+        """
+        Computes gcd(n_i, product of all other moduli) for every n_i.
+        Returns: List of gcds (1 means the key shares no prime with the set).
+        """
+        if not moduli:
+            return []
+
+        # Pass 1: product of each chunk (only the roots are kept)
+        chunk_products = [self._product_tree(chunk)[-1][0] for chunk in self._chunks(moduli)]
+
+        # Pass 2: full product mod (chunk product)^2 for every chunk, through a
+        # product/remainder tree over the chunk products
+        top = self._product_tree(chunk_products)
+        chunk_remainders = self._remainder_tree(top[-1][0], top)
+        del top, chunk_products
+
+        gcds = []
+        # Pass 3: push each chunk's remainder down that chunk's own tree
+        for chunk, total in zip(self._chunks(moduli), chunk_remainders):
+            tree = self._product_tree(chunk)
+            remainders = self._remainder_tree(total, tree)
+            for n, r in zip(chunk, remainders):
+                gcds.append(self.rsa.gcd(int(r // n), n))
+            del tree, remainders
+        return gcds
+
+    def attack(self, public_keys):
+        """
+        Finds all keys in public_keys [(e, n), ...] that share a prime.
+        Returns: List of dicts, one per broken key, with the recovered
+        private key (d, n), its factors and the indices of the keys it shares a prime with.
+        """
+        moduli = [n for _, n in public_keys]
+        print(f"[Batch GCD] Scanning {len(moduli)} moduli in chunks of {self.chunk_size}...")
+        gcds = self.batch_gcd(moduli)
+        vulnerable = [i for i, g in enumerate(gcds) if g != 1]
+        print(f"[Batch GCD] {len(vulnerable)} moduli share a factor with another key.")
+
+        # The vulnerable set is small, so resolve the exact pairs with plain gcds.
+        # This also splits keys whose batch gcd was n itself (both primes shared).
+        results = []
+        for i in vulnerable:
+            e, n = public_keys[i]
+            p = None
+            shares_with = []
+            for j in vulnerable:
+                if j == i:
+                    continue
+                g = self.rsa.gcd(n, moduli[j])
+                if g == 1:
+                    continue
+                shares_with.append(j)
+                if g != n and p is None:
+                    p = g
+            if p is None:
+                g = gcds[i]
+                if g != n:
+                    p = g
+            if p is None:
+                print(f"[Batch GCD] Key #{i} is a duplicate modulus; cannot split it.")
+                continue
+
+            q = n // p
+            phi = (p - 1) * (q - 1)
+            if self.rsa.gcd(e, phi) != 1:
+                print(f"[Batch GCD] Key #{i}: e is not invertible mod phi, skipping.")
+                continue
+            d = self.rsa.mod_inverse(e, phi)
+            results.append({
+                "index": i,
+                "public_key": (e, n),
+                "private_key": (d, n),
+                "details": {
+                    "p": p,
+                    "q": q,
+                    "phi": phi,
+                    "d": d
+                },
+                "shares_with": shares_with
+            })
+        return results
+
+    def scan_file(self, path):
+        """Convenience wrapper: load keys from path and run attack()."""
+        return self.attack(self.load_keys(path))
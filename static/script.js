@@ -80,8 +80,12 @@ async function caesarAttack() {
     const text = document.getElementById('caesar-input').value;
     document.getElementById('caesar-output').innerText = "Attacking... please wait.";
     const res = await postData('/api/caesar/attack', { text });
+    if (res.error) {
+        document.getElementById('caesar-output').innerText = "Error: " + res.error;
+        return;
+    }
 
-    let html = "<h3>Top Recommendations:</h3>";
+    let html = `<h3>${resultsTitle(res.partial)}</h3>`;
     res.results.forEach(r => {
         html += `<div class="result-item">
             <div class="result-header">
@@ -117,11 +121,83 @@ async function transDecrypt() {
 
 async function transAttack() {
     const text = document.getElementById('trans-input').value;
-    document.getElementById('trans-output').innerText = "Attacking... please wait.";
-    const res = await postData('/api/transposition/attack', { text });
+    const output = document.getElementById('trans-output');
+    output.innerText = "Attacking... please wait.";
+
+    // Stream progress and improving candidates as the server finds them
+    let best = [];
+    let pct = 0;
+    await streamEvents('/api/transposition/attack/stream', { text }, (event, data) => {
+        if (event === 'error') {
+            output.innerText = "Error: " + data.error;
+            return;
+        }
+        if (event === 'candidate') {
+            best = [data];
+        } else if (event === 'progress') {
+            pct = (data.done / data.total * 100).toFixed(0);
+            best = data.top;
+        } else if (event === 'done') {
+            output.innerHTML = renderResults(resultsTitle(data.partial), data.results);
+            return;
+        }
+        output.innerHTML = renderResults(`Searching... ${pct}% (best so far)`, best);
+    });
+}
 
-    let html = "<h3>Top Recommendations:</h3>";
-    res.results.forEach(r => {
+// Reads a text/event-stream response from a POST request.
+// Calls onEvent(eventName, parsedData) for every event as it arrives.
+// A rejected request (413/429/503...) is reported as one 'error' event.
+async function streamEvents(url, data, onEvent) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    });
+    if (!response.ok) {
+        let error = `${response.status} ${response.statusText}`;
+        try {
+            error = (await response.json()).error || error;
+        } catch (e) {
+            // Not a JSON error body; keep the HTTP status
+        }
+        onEvent('error', { error });
+        return;
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            let event = 'message';
+            let payload = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) payload += line.slice(6);
+            });
+            onEvent(event, JSON.parse(payload));
+        }
+    }
+}
+
+// The server returns partial results when the attack's time budget runs out
+function resultsTitle(partial) {
+    return partial
+        ? "Top Recommendations (partial: time limit reached, not every key was tried):"
+        : "Top Recommendations:";
+}
+
+function renderResults(title, results) {
+    let html = `<h3>${title}</h3>`;
+    results.forEach(r => {
         html += `<div class="result-item">
             <div class="result-header">
                 <span class="result-score">${(r.score * 100).toFixed(1)}% Match</span> | Key: ${r.key}
@@ -136,7 +212,7 @@ async function transAttack() {
             </div>
         </div>`;
     });
-    document.getElementById('trans-output').innerHTML = html;
+    return html;
 }
 
 // --- RSA ---
@@ -157,8 +233,9 @@ async function rsaEncrypt() {
     const text = document.getElementById('rsa-input').value;
     const e = document.getElementById('rsa-e').value;
     const n = document.getElementById('rsa-n').value;
+    const format = document.getElementById('rsa-format').value;
 
-    const res = await postData('/api/rsa/encrypt', { text, e, n });
+    const res = await postData('/api/rsa/encrypt', { text, e, n, format });
     if (res.error) {
         document.getElementById('rsa-output').innerText = "Error: " + res.error;
     } else {
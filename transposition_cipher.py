@@ -1,6 +1,23 @@
+import os
+import sys
+import json
 import math
+import time
+import heapq
 import itertools
+import functools
+import hashlib
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from ai_recommender import AIRecommender
+from knowledge_base import loader
+from utils import ordered_pool_map
+from metrics import STAGE_SECONDS, ATTACK_SECONDS, CANDIDATES_SCORED
 
 class TranspositionCipher:
     """
@@ -34,67 +51,214 @@ class TranspositionCipher:
 
     def encrypt(self, plaintext, key):
         key_seq = self._get_key_sequence(key)
-        num_cols = len(key_seq)
+        # Read off the columns (every num_cols-th char) in key_sequence order
+        index = _encrypt_index(len(plaintext), tuple(key_seq))
+        return _gather(plaintext, index)
+
+    @STAGE_SECONDS.time(stage="transposition_decrypt")
+    def decrypt(self, ciphertext, key):
+        key_seq = self._get_key_sequence(key)
+        index = _decrypt_index(len(ciphertext), tuple(key_seq))
+        return _gather(ciphertext, index)
 
-        # Build grid
-        grid = [''] * num_cols
-        for i, char in enumerate(plaintext):
-            col_idx = i % num_cols
-            grid[col_idx] += char
+    @STAGE_SECONDS.time(stage="transposition_decrypt")
+    def decrypt_many(self, ciphertext, keys):
+        """
+        Decrypts one ciphertext under many keys of the same length (e.g. a
+        batch of permutations). With NumPy, all index arrays are built and
+        applied in one vectorized gather over a (len(keys), len(text)) array;
+        without it, each key uses the cached per-key index.
+        Recorded as one transposition_decrypt stage per batch.
+        Returns: list of plaintexts, in key order.
+        """
+        key_seqs = [self._get_key_sequence(k) for k in keys]
+        if np is None or not key_seqs or not ciphertext or isinstance(ciphertext, (bytes, bytearray)) \
+                or len({len(k) for k in key_seqs}) != 1:
+            return [_gather(ciphertext, _decrypt_index(len(ciphertext), tuple(k))) for k in key_seqs]
 
-        # Read off columns in key_sequence order
-        ciphertext = []
-        for col_idx in key_seq:
-            ciphertext.append(grid[col_idx])
+        # ASCII packs into 1 byte per char, anything else into UTF-32 code points
+        if ciphertext.isascii():
+            encoding, dtype = 'ascii', np.uint8
+        else:
+            encoding, dtype = 'utf-32-le', np.uint32
+        buf = np.frombuffer(ciphertext.encode(encoding), dtype=dtype)
+        rows = buf[_decrypt_index_matrix(len(ciphertext), np.array(key_seqs))]
+        return [row.tobytes().decode(encoding) for row in rows]
 
-        return ''.join(ciphertext)
 
-    def decrypt(self, ciphertext, key):
-        key_seq = self._get_key_sequence(key)
-        num_cols = len(key_seq)
-        num_rows = math.ceil(len(ciphertext) / num_cols)
-        num_empty_cells = (num_rows * num_cols) - len(ciphertext)
-        num_full_cells = num_cols - num_empty_cells
-
-        # The grid is conceptually filled row by row.
-        # But we receive it column by column.
-        # We need to calculate how many characters belong to each column.
-        # Columns 0 to (num_full_cells - 1) have 'num_rows' chars.
-        # Columns num_full_cells to end have 'num_rows - 1' chars.
-
-        col_lengths = [0] * num_cols
-        for i in range(num_cols):
-            if i < num_full_cells:
-                col_lengths[i] = num_rows
-            else:
-                col_lengths[i] = num_rows - 1
+# Gather indices: output[i] = input[index[i]]. They depend only on the text
+# length and the column order, so one computation serves every text of that
+# length (every candidate of an attack, every message of a batch).
+# Only short texts are cached, as compact 4-byte arrays: at most
+# INDEX_CACHE_ENTRIES x INDEX_CACHE_MAX_LEN x 4 bytes (16 MB). Longer texts
+# build their index per call, so large inputs cannot pin memory.
+INDEX_CACHE_ENTRIES = 4096
+INDEX_CACHE_MAX_LEN = 1024
 
-        # Now split the ciphertext into columns based on the key sequence.
-        # The ciphertext comes in the order of key_seq.
+def _build_encrypt_index(length, key_seq):
+    num_cols = len(key_seq)
+    return [p for col in key_seq for p in range(col, length, num_cols)]
 
-        cols_data = {}
-        current_idx = 0
+def _column_lengths(length, num_cols):
+    # The grid is filled row by row, so the first (length % num_cols)
+    # columns hold one more char than the rest
+    num_rows, extra = divmod(length, num_cols)
+    return [num_rows + 1 if c < extra else num_rows for c in range(num_cols)]
 
-        for col_idx in key_seq:
-            # How long is this specific column (in the original grid)?
-            length = col_lengths[col_idx]
-            # Extract that chunk
-            cols_data[col_idx] = ciphertext[current_idx : current_idx + length]
-            current_idx += length
+def _build_decrypt_index(length, key_seq):
+    # The ciphertext holds the columns in key_seq order; plaintext position p
+    # is row p // num_cols of column p % num_cols
+    num_cols = len(key_seq)
+    col_lengths = _column_lengths(length, num_cols)
+    index = [0] * length
+    offset = 0
+    for col in key_seq:
+        index[col::num_cols] = range(offset, offset + col_lengths[col])
+        offset += col_lengths[col]
+    return index
 
-        # Reconstruct the grid
-        plaintext = []
-        for r in range(num_rows):
-            for c in range(num_cols):
-                # Check if this cell exists (handle the short columns at end)
-                if c >= num_full_cells and r == num_rows - 1:
-                    continue # This cell was empty in the original grid
+@functools.lru_cache(maxsize=INDEX_CACHE_ENTRIES)
+def _cached_encrypt_index(length, key_seq):
+    return array('i', _build_encrypt_index(length, key_seq))
 
-                # Append character if index exists
-                if r < len(cols_data[c]):
-                    plaintext.append(cols_data[c][r])
+@functools.lru_cache(maxsize=INDEX_CACHE_ENTRIES)
+def _cached_decrypt_index(length, key_seq):
+    return array('i', _build_decrypt_index(length, key_seq))
 
-        return ''.join(plaintext)
+def _encrypt_index(length, key_seq):
+    if length > INDEX_CACHE_MAX_LEN:
+        return _build_encrypt_index(length, key_seq)
+    return _cached_encrypt_index(length, key_seq)
+
+def _decrypt_index(length, key_seq):
+    if length > INDEX_CACHE_MAX_LEN:
+        return _build_decrypt_index(length, key_seq)
+    return _cached_decrypt_index(length, key_seq)
+
+def _decrypt_index_matrix(length, key_seqs):
+    """Vectorized _decrypt_index for a (num_keys, num_cols) array of column orders."""
+    num_keys, num_cols = key_seqs.shape
+    col_lengths = np.array(_column_lengths(length, num_cols))
+    # Start of each column in the ciphertext: exclusive cumsum in key order, scattered back by column
+    in_order = np.cumsum(col_lengths[key_seqs], axis=1) - col_lengths[key_seqs]
+    col_start = np.empty_like(in_order)
+    np.put_along_axis(col_start, key_seqs, in_order, axis=1)
+    positions = np.arange(length)
+    return col_start[:, positions % num_cols] + positions // num_cols
+
+def permutation_rank(perm):
+    """Lexicographic rank of a permutation of range(len(perm)) (its index in itertools.permutations)."""
+    remaining = sorted(perm)
+    rank = 0
+    for i, x in enumerate(perm):
+        j = remaining.index(x)
+        rank += j * math.factorial(len(perm) - 1 - i)
+        remaining.pop(j)
+    return rank
+
+def permutation_unrank(k, rank):
+    """Inverse of permutation_rank(): the permutation of range(k) with the given rank."""
+    remaining = list(range(k))
+    perm = []
+    for i in range(k - 1, -1, -1):
+        j, rank = divmod(rank, math.factorial(i))
+        perm.append(remaining.pop(j))
+    return tuple(perm)
+
+def _permutations(k, start, stop):
+    """Permutations of range(k) with ranks start..stop-1, in lexicographic order."""
+    if start >= stop:
+        return # Nothing left (e.g. a width a checkpoint recorded as finished)
+    if start == 0:
+        yield from itertools.islice(itertools.permutations(range(k)), stop)
+        return
+    perm = list(permutation_unrank(k, start))
+    for _ in range(stop - start):
+        yield tuple(perm)
+        # Next permutation: swap the rightmost ascent with its smallest larger successor, reverse the tail
+        i = k - 2
+        while i >= 0 and perm[i] > perm[i + 1]:
+            i -= 1
+        if i < 0:
+            return
+        j = k - 1
+        while perm[j] < perm[i]:
+            j -= 1
+        perm[i], perm[j] = perm[j], perm[i]
+        perm[i + 1:] = reversed(perm[i + 1:])
+
+# Keyword attack: dictionaries the keywords come from, and the generated index of their column orders
+KEYWORD_SOURCES = ("word_list.txt", "words.txt")
+KEYWORD_INDEX_FILE = "keyword_index.txt"
+KEYWORD_MAX_LEN = 15
+
+def _keyword_fingerprint(sources):
+    """Name, size and mtime of each source (same scheme as FrequencyLoader.version)."""
+    h = hashlib.sha256(f"maxlen{KEYWORD_MAX_LEN};".encode('utf-8'))
+    for path in sources:
+        if os.path.exists(path):
+            st = os.stat(path)
+            h.update(f"{os.path.basename(path)}:{st.st_size}:{int(st.st_mtime)};".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+@functools.lru_cache(maxsize=4)
+def load_keyword_index(index_path=KEYWORD_INDEX_FILE, sources=KEYWORD_SOURCES):
+    """
+    Unique column orders produced by the dictionary words, per key length:
+    {length: {order (tuple): first keyword giving it}}. Many words share an
+    order (about 160k orders for lengths 2-15, out of 270k words).
+    Built from the sources with TranspositionCipher._get_key_sequence() and
+    saved to index_path ('<order as letters> <keyword>' per line); rebuilt
+    whenever a source file changes.
+    """
+    fingerprint = _keyword_fingerprint(sources)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            if f.readline().strip() == f"# {fingerprint}":
+                for line in f:
+                    code, keyword = line.split()
+                    index.setdefault(len(code), {})[tuple(ord(c) - 97 for c in code)] = keyword
+                return index
+
+    print("[AI] Building the keyword index...", file=sys.stderr)
+    cipher = TranspositionCipher()
+    for path in sources:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                parts = line.split()
+                word = parts[0].lower() if parts else ''
+                if word.isalpha() and 2 <= len(word) <= KEYWORD_MAX_LEN:
+                    order = tuple(cipher._get_key_sequence(word))
+                    index.setdefault(len(word), {}).setdefault(order, word)
+    try:
+        tmp = f"{index_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(f"# {fingerprint}\n")
+            for length in sorted(index):
+                for order, keyword in index[length].items():
+                    f.write(f"{''.join(chr(97 + i) for i in order)} {keyword}\n")
+        os.replace(tmp, index_path)
+    except OSError as err:
+        print(f"[Warning] Could not save the keyword index: {err}", file=sys.stderr)
+    return index
+
+VOWELS = set('aeiou')
+
+@functools.lru_cache(maxsize=1)
+def _char_bigram_log_probs():
+    """log10 P(bigram) from the char bigram counts; key None holds the floor for unseen pairs."""
+    total = loader.total_char_bigrams or 1
+    table = {bigram: math.log10(count / total) for bigram, count in loader.char_bigrams.items()}
+    table[None] = math.log10(0.01 / total)
+    return table
+
+def _gather(text, index):
+    if isinstance(text, (bytes, bytearray)):
+        return bytes(map(text.__getitem__, index))
+    return ''.join(map(text.__getitem__, index))
 
 
 class TranspositionAttacker:
@@ -102,58 +266,348 @@ class TranspositionAttacker:
         self.cipher = TranspositionCipher()
         self.ai = AIRecommender()
         self.MAX_KEY_LEN_BRUTE = 8 # 8! = 40,320 checks (Fast & Stable)
+        self.DECRYPT_BATCH = 1024 # Permutations decrypted per decrypt_many() call
+        self.VOWEL_WEIGHT = 2.0 # Weight of the vowel-spread test in estimate_key_lengths()
+        self.CONFIDENT_SCORE = 0.85 # Top score needed for a "HIGH (MATCH FOUND)" verdict...
+        self.CONFIDENT_GAP = 0.1 # ...and its lead over the runner-up
+        self.CHECKPOINT_SECONDS = 10.0 # Interval between checkpoint saves
+        self.CHECKPOINT_TOP = 100 # Candidates kept in a checkpoint (the ranking returns at most 100)
 
-    def attack(self, ciphertext, check_caesar=False):
+    def estimate_key_lengths(self, ciphertext, max_len=None):
         """
-        Attempts to brute force column orders for key lengths 2 to MAX.
-        If check_caesar is True, it scores candidates based on their potential
-        to be English after a Caesar shift (for Triple Lock).
+        Ranks the key lengths worth searching, most likely first, from cheap
+        column statistics of the grid each width implies (exact column
+        boundaries when the width divides the length, approximate otherwise):
+          - adjacency: for each column, the mean English char-bigram log prob
+            with its best partner column, averaged, minus the all-pairs mean.
+            True neighbours read as English row by row.
+          - vowel spread: variance of the vowel count per row relative to a
+            random (binomial) spread. Real rows are contiguous text, so their
+            vowels are spread more evenly than in shuffled rows.
+        Widths above the text length are dropped: width len(text) already
+        covers every arrangement of the characters.
+        max_len: largest width considered (default MAX_KEY_LEN_BRUTE).
+        Returns: [(width, score), ...] sorted by score, best first.
+        """
+        text = ciphertext.lower()
+        widths = range(2, min(max_len or self.MAX_KEY_LEN_BRUTE, max(len(text), 2)) + 1)
+        scores = [(k, self._width_score(text, k)) for k in widths]
+        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+    def _width_score(self, text, k):
+        num_short, extra = divmod(len(text), k)
+        if num_short < 2:
+            return 0.0 # Too few rows to tell anything
+        # Expected column starts (long columns spread evenly); first num_short chars of each
+        cols = [text[s:s + num_short] for s in (i * num_short + round(i * extra / k) for i in range(k))]
+
+        letters = [c for c in text if c.isalpha()]
+        p = sum(c in VOWELS for c in letters) / len(letters) if letters else 0.0
+        counts = [sum(col[r] in VOWELS for col in cols) for r in range(num_short)]
+        mean = sum(counts) / num_short
+        vowel_ratio = sum((x - mean) ** 2 for x in counts) / num_short / (k * p * (1 - p) or 1.0)
+
+        log_probs = _char_bigram_log_probs()
+        floor = log_probs[None]
+        pair = [[None] * k for _ in range(k)]
+        all_pairs = []
+        for i in range(k):
+            for j in range(k):
+                if i == j:
+                    continue
+                values = [log_probs.get(a + b, floor) for a, b in zip(cols[i], cols[j])
+                          if a.isalpha() and b.isalpha()]
+                if values:
+                    pair[i][j] = sum(values) / len(values)
+                    all_pairs.append(pair[i][j])
+        adjacency = 0.0
+        if all_pairs:
+            best = [max(v for v in row if v is not None) for row in pair if any(v is not None for v in row)]
+            adjacency = sum(best) / len(best) - sum(all_pairs) / len(all_pairs)
+        return adjacency - self.VOWEL_WEIGHT * vowel_ratio
+
+    def _decrypted(self, ciphertext, perms):
+        """Yields (permutation, plaintext) for every column order of perms (same width), decrypted in batches."""
+        while True:
+            batch = list(itertools.islice(perms, self.DECRYPT_BATCH))
+            if not batch:
+                return
+            yield from zip(batch, self.cipher.decrypt_many(ciphertext, batch))
+
+    def keyspace_ranges(self, key_range=None):
+        """
+        Maps a slice of the global keyspace to per-width rank ranges.
+        Keys are numbered width by width (2 first), by lexicographic rank within
+        a width, so [0, keyspace_size()) can be split across machines.
+        Returns: {width: (start, stop)} for the widths the slice touches.
+        """
+        start, stop = key_range or (0, self.keyspace_size())
+        ranges = {}
+        offset = 0
+        for k_len in range(2, self.MAX_KEY_LEN_BRUTE + 1):
+            size = math.factorial(k_len)
+            lo, hi = max(start, offset) - offset, min(stop, offset + size) - offset
+            if lo < hi:
+                ranges[k_len] = (lo, hi)
+            offset += size
+        return ranges
+
+    def keyspace_size(self):
+        return sum(math.factorial(k) for k in range(2, self.MAX_KEY_LEN_BRUTE + 1))
+
+    def _load_checkpoint(self, path, search):
+        """Returns the saved state at path, or None if there is none. Raises ValueError if it belongs to another search."""
+        try:
+            with open(path, 'r') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return None
+        for field, value in search.items():
+            if saved.get(field) != value:
+                raise ValueError(f"Checkpoint {path} is for a different search ({field} differs)")
+        return saved
+
+    def _save_checkpoint(self, path, state):
+        """Writes the state atomically, so a crash mid-write leaves the previous checkpoint intact."""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def attack_iter(self, ciphertext, check_caesar=False, tick=5000, top_n=5, deadline=None, prune_widths=None,
+                    stop_early=False, checkpoint=None, key_range=None):
+        """
+        Generator version of attack().
+        Yields events as the search runs:
+          {"event": "candidate", "candidate": {...}}    - a new best candidate
+          {"event": "progress", "done", "total", "top"}  - every 'tick' checks (top = best top_n so far)
+          {"event": "done", "results": [...], "complete", "stopped_early", "skipped"} - final ranking (same as attack())
+        deadline: optional time.monotonic() value. When it passes, the search
+        stops and 'done' carries the best-so-far ranking with complete=False.
+        Key lengths are searched in estimate_key_lengths() order.
+        prune_widths: optional score margin; widths scoring more than this below
+        the best width are skipped (2.5 skips ~11% of wrong widths and loses
+        the true one ~1% of the time). None searches every width.
+        stop_early: stop after a key length once the best candidate passes the
+        "HIGH (MATCH FOUND)" test against the best candidate with a different
+        plaintext (longer keys that merely repeat it do not count). 'skipped'
+        in the 'done' event is the fraction of the keyspace left unsearched.
+        The margin was only checked against the keys searched, so the top
+        result is then labelled "HIGH (UNVERIFIED - PARTIAL SEARCH)".
+        checkpoint: optional file path. The position reached in each key length
+        and the top CHECKPOINT_TOP candidates are saved there every
+        CHECKPOINT_SECONDS and at the end of each key length; if the file
+        exists, the search resumes from it.
+        key_range: optional (start, stop) slice of the global keyspace to search
+        (see keyspace_ranges()).
+        """
+        estimates = self.estimate_key_lengths(ciphertext)
+        if prune_widths is not None and estimates:
+            estimates = [(k, s) for k, s in estimates if s >= estimates[0][1] - prune_widths]
+        ranges = self.keyspace_ranges(key_range)
+        plan = [(k, *ranges[k], functools.partial(_permutations, k)) for k, _ in estimates if k in ranges]
+        print(f"\n[AI] Generating permutations for key lengths {', '.join(str(k) for k, *_ in plan)} "
+              f"(most likely first)...")
+        search = {
+            "mode": "bruteforce",
+            "max_key_len": self.MAX_KEY_LEN_BRUTE,
+            "key_range": list(key_range) if key_range else None,
+        }
+        yield from self._search(ciphertext, plan, search, check_caesar, tick, top_n, deadline, stop_early,
+                                checkpoint)
+
+    def keyword_attack_iter(self, ciphertext, check_caesar=False, tick=5000, top_n=5, deadline=None,
+                            stop_early=False, checkpoint=None, max_len=KEYWORD_MAX_LEN):
+        """
+        Dictionary keyword attack: tries only the column orders that some word
+        of the keyword index produces (see load_keyword_index()), for key
+        lengths 2..max_len, most likely length first. Reaches 9-15 letter
+        keywords, far beyond the brute-force limit. Candidates carry the first
+        keyword found for their order under "keyword".
+        Yields the same events as attack_iter() and takes the same deadline,
+        stop_early and checkpoint options.
+        """
+        index = load_keyword_index()
+        plan = []
+        for k, _ in self.estimate_key_lengths(ciphertext, max_len):
+            if k in index:
+                orders = list(index[k])
+                plan.append((k, 0, len(orders), functools.partial(itertools.islice, orders)))
+        print(f"\n[AI] Trying {sum(hi for _, _, hi, _ in plan)} dictionary keyword orders for key lengths "
+              f"{', '.join(str(k) for k, *_ in plan)} (most likely first)...")
+        search = {
+            "mode": "keywords",
+            "max_key_len": max_len,
+            "keyword_index": _keyword_fingerprint(KEYWORD_SOURCES),
+        }
+        yield from self._search(ciphertext, plan, search, check_caesar, tick, top_n, deadline, stop_early,
+                                checkpoint, keywords=index)
+
+    def _search(self, ciphertext, plan, search, check_caesar, tick, top_n, deadline, stop_early, checkpoint,
+                keywords=None):
+        """
+        The search loop shared by attack_iter() and keyword_attack_iter().
+        plan: [(width, start, stop, orders), ...] in search order, where
+        orders(start, stop) yields the width's column orders at positions
+        start..stop-1. Positions are what checkpoints record.
+        search: fields identifying the search in a checkpoint (the ciphertext
+        digest and check_caesar are added here).
+        keywords: optional {width: {order: keyword}}, to label candidates.
+        Yields the attack_iter() events.
         """
         candidates = []
-        print(f"\n[AI] Generating permutations for key lengths 2-{self.MAX_KEY_LEN_BRUTE}...")
-        
+        best_score = -1.0
+        best_text = None
+        runner_up = -1.0 # Best score among plaintexts other than best_text
+        timed_out = False
+        stopped_early = False
+        start = time.perf_counter()
+
         total_checks = 0
+        total_perms = sum(hi - lo for _, lo, hi, _ in plan)
+        search = dict(search, ciphertext=hashlib.sha256(ciphertext.encode('utf-8')).hexdigest(),
+                      check_caesar=check_caesar)
+        state = dict(search, positions={}, checks=0, finished=False, top=[]) # positions: str(width) -> next position
+        saved = self._load_checkpoint(checkpoint, search) if checkpoint else None
+        if saved:
+            state = saved
+            total_checks = saved["checks"]
+            candidates = saved["top"]
+            for c in candidates:
+                if c['score'] > best_score:
+                    best_score, best_text = c['score'], c['plaintext']
+            runner_up = max((c['score'] for c in candidates if c['plaintext'] != best_text), default=-1.0)
+            print(f"\n[AI] Resuming from {checkpoint} after {total_checks}/{total_perms} checks.", end="")
+        if state["finished"]:
+            plan = []
+        last_save = time.monotonic()
+
+        def save():
+            state["checks"] = total_checks
+            state["top"] = candidates
+            self._save_checkpoint(checkpoint, state)
 
         # Iterate through possible key lengths
-        for k_len in range(2, self.MAX_KEY_LEN_BRUTE + 1):
-            perms = itertools.permutations(range(k_len))
-            
-            for p in perms:
+        for k_len, lo, hi, orders in plan:
+            position = state["positions"].get(str(k_len), lo)
+            for p, decrypted_text in self._decrypted(ciphertext, orders(position, hi)):
+                if deadline is not None and time.monotonic() > deadline:
+                    timed_out = True
+                    break
                 total_checks += 1
-                if total_checks % 5000 == 0:
+                position += 1
+                if total_checks % tick == 0:
                     print(f".", end="", flush=True)
+                    yield {
+                        "event": "progress",
+                        "done": total_checks,
+                        "total": total_perms,
+                        "top": heapq.nlargest(top_n, candidates, key=lambda x: x['score'])
+                    }
                 
                 try:
-                    decrypted_text = self.cipher.decrypt(ciphertext, list(p))
-                    
-                    if check_caesar:
-                        # Use the new method to check if it looks like shifted English
-                        score = self.ai.analyze_substitution_potential(decrypted_text)
-                        analysis = {"score": score, "details": ["Caesar Potential Check"]}
-                        corrections = []
+                    candidate = self._candidate(k_len, p, decrypted_text, check_caesar)
+                    if keywords is not None:
+                        candidate["keyword"] = keywords[k_len][p]
+                    score, decrypted_text = candidate["score"], candidate["plaintext"]
+                    candidates.append(candidate)
+                    CANDIDATES_SCORED.inc(attack="transposition")
+                    if decrypted_text == best_text:
+                        best_score = max(best_score, score)
+                    elif score > best_score:
+                        runner_up = best_score
+                        best_score = score
+                        best_text = decrypted_text
+                        yield {"event": "candidate", "candidate": candidate}
                     else:
-                        analysis = self.ai.analyze(decrypted_text)
-                        score = analysis['score']
-                        # Auto-correct if score is decent
-                        corrections = []
-                        if score > 0.6:
-                            corrected_text, corrections = self.ai.auto_correct(decrypted_text)
-                            if corrections:
-                                decrypted_text = corrected_text
-
-                    candidates.append({
-                        "key": f"Len {k_len} | {list(p)}",
-                        "plaintext": decrypted_text,
-                        "score": score,
-                        "details": analysis,
-                        "corrections": corrections
-                    })
+                        runner_up = max(runner_up, score)
                 except Exception as e:
                     print(f"DEBUG ERROR: {e}")
                     continue
+                finally:
+                    if checkpoint and time.monotonic() - last_save > self.CHECKPOINT_SECONDS:
+                        state["positions"][str(k_len)] = position
+                        # Only the top candidates are kept (the ranking never returns more)
+                        candidates = heapq.nlargest(self.CHECKPOINT_TOP, candidates, key=lambda x: x['score'])
+                        save()
+                        last_save = time.monotonic()
+
+            state["positions"][str(k_len)] = position
+            if timed_out:
+                print(f"\n[AI] Deadline reached after {total_checks}/{total_perms} checks.", end="")
+                break
+            if stop_early and self._is_confident(best_score, runner_up) and total_checks < total_perms:
+                stopped_early = True
+                print(f"\n[AI] Confident match after {total_checks}/{total_perms} checks, "
+                      f"skipped {1 - total_checks / total_perms:.1%} of the keyspace.", end="")
+                break
+            if checkpoint:
+                candidates = heapq.nlargest(self.CHECKPOINT_TOP, candidates, key=lambda x: x['score'])
+                save()
+                last_save = time.monotonic()
+
+        if checkpoint:
+            state["finished"] = not timed_out
+            candidates = heapq.nlargest(self.CHECKPOINT_TOP, candidates, key=lambda x: x['score'])
+            save()
 
         print() # Newline after dots
-        
+        yield {
+            "event": "progress",
+            "done": total_checks,
+            "total": total_perms,
+            "top": heapq.nlargest(top_n, candidates, key=lambda x: x['score'])
+        }
+        results = self._rank(candidates, partial=stopped_early or timed_out)
+        ATTACK_SECONDS.observe(time.perf_counter() - start, attack="transposition")
+        yield {
+            "event": "done",
+            "results": results,
+            "complete": not timed_out,
+            "stopped_early": stopped_early,
+            "skipped": 1 - total_checks / total_perms if total_perms else 0.0,
+        }
+
+    def _candidate(self, k_len, p, decrypted_text, check_caesar):
+        """Scores one decryption. Returns the candidate dict (plaintext auto-corrected when it scores well)."""
+        if check_caesar:
+            # Use the new method to check if it looks like shifted English
+            score = self.ai.analyze_substitution_potential(decrypted_text)
+            analysis = {"score": score, "details": ["Caesar Potential Check"]}
+            corrections = []
+        else:
+            analysis = self.ai.analyze(decrypted_text)
+            score = analysis['score']
+            # Auto-correct if score is decent
+            corrections = []
+            if score > 0.6:
+                corrected_text, corrections = self.ai.auto_correct(decrypted_text)
+                if corrections:
+                    decrypted_text = corrected_text
+
+        return {
+            "key": f"Len {k_len} | {list(p)}",
+            "plaintext": decrypted_text,
+            "score": score,
+            "details": analysis,
+            "corrections": corrections
+        }
+
+    def keyword_attack(self, ciphertext, check_caesar=False, progress=None, deadline=None, stop_early=False,
+                       checkpoint=None, with_summary=False):
+        """
+        Dictionary keyword attack (see keyword_attack_iter()).
+        progress: optional callback(done, total, top) called every 5000 checks.
+        with_summary: return (results, summary) instead (see attack()).
+        """
+        events = self.keyword_attack_iter(ciphertext, check_caesar, deadline=deadline, stop_early=stop_early,
+                                          checkpoint=checkpoint)
+        return _finish(events, progress, with_summary)
+
+    def _is_confident(self, top_score, second_score):
+        return top_score > self.CONFIDENT_SCORE and top_score - second_score > self.CONFIDENT_GAP
+
+    def _rank(self, candidates, partial=False):
         # Sort desc
         candidates.sort(key=lambda x: x['score'], reverse=True)
         
@@ -161,11 +615,12 @@ class TranspositionAttacker:
         if candidates:
             top = candidates[0]
             # If top score is high (>0.85) AND significantly better than #2
-            if top['score'] > 0.85:
+            if top['score'] > self.CONFIDENT_SCORE:
                 if len(candidates) > 1:
                     second = candidates[1]
-                    if top['score'] - second['score'] > 0.1:
-                        top['confidence'] = "HIGH (MATCH FOUND)"
+                    if self._is_confident(top['score'], second['score']):
+                        # After an early stop or timeout, #2 only beat the keys searched so far
+                        top['confidence'] = "HIGH (UNVERIFIED - PARTIAL SEARCH)" if partial else "HIGH (MATCH FOUND)"
                     else:
                         top['confidence'] = "MEDIUM"
                 else:
@@ -175,3 +630,79 @@ class TranspositionAttacker:
         
         # Return only top 100 to keep UI clean, but having scanned ALL of them.
         return candidates[:100]
+
+    def attack(self, ciphertext, check_caesar=False, progress=None, deadline=None, prune_widths=None,
+               stop_early=False, checkpoint=None, key_range=None, with_summary=False):
+        """
+        Attempts to brute force column orders for key lengths 2 to MAX.
+        If check_caesar is True, it scores candidates based on their potential
+        to be English after a Caesar shift (for Triple Lock).
+        progress: optional callback(done, total, top) called every 5000 checks.
+        deadline: optional time.monotonic() value; returns the best-so-far ranking when it passes.
+        prune_widths: optional margin for skipping unlikely key lengths (see attack_iter()).
+        stop_early: stop once the top result is a confident match (see attack_iter()).
+        checkpoint: optional file to save progress to and resume from (see attack_iter()).
+        key_range: optional (start, stop) slice of the keyspace to search (see keyspace_ranges()).
+        with_summary: return (results, summary), where summary holds the 'done'
+        event's complete, stopped_early and skipped fields.
+        """
+        events = self.attack_iter(ciphertext, check_caesar, deadline=deadline, prune_widths=prune_widths,
+                                  stop_early=stop_early, checkpoint=checkpoint, key_range=key_range)
+        return _finish(events, progress, with_summary)
+
+    def attack_many(self, ciphertexts, check_caesar=False, workers=None, top_n=5, time_budget=None,
+                    stop_early=False, checkpoint_dir=None, key_range=None, keywords=False, with_summary=False):
+        """
+        Attacks many ciphertexts, spread across processes.
+        ciphertexts may be any iterable (consumed lazily).
+        time_budget: optional seconds allowed per ciphertext (best-so-far when exceeded).
+        stop_early: stop each attack at a confident match (see attack_iter()).
+        checkpoint_dir: optional directory of per-ciphertext checkpoints (see checkpoint_path()).
+        key_range: optional (start, stop) slice of the keyspace to search for every ciphertext.
+        keywords: run the dictionary keyword attack instead (see keyword_attack_iter()).
+        with_summary: yield (results, summary) pairs instead (see attack()).
+        Yields the top_n results for each ciphertext, in input order.
+        """
+        workers = workers or os.cpu_count() or 1
+        args = ((text, check_caesar, top_n, time_budget, stop_early, checkpoint_dir, key_range, keywords,
+                 with_summary) for text in ciphertexts)
+        return ordered_pool_map(_attack_worker, args, workers, initializer=_init_worker)
+
+
+# Per-process attacker for attack_many() (built once per worker, not per message)
+_worker_attacker = None
+
+def _init_worker():
+    global _worker_attacker
+    _worker_attacker = TranspositionAttacker()
+
+def _attack_worker(text, check_caesar, top_n, time_budget=None, stop_early=False, checkpoint_dir=None,
+                   key_range=None, keywords=False, with_summary=False):
+    deadline = time.monotonic() + time_budget if time_budget else None
+    checkpoint = checkpoint_path(checkpoint_dir, text, check_caesar, key_range, keywords) if checkpoint_dir else None
+    if keywords:
+        results, summary = _worker_attacker.keyword_attack(text, check_caesar, deadline=deadline,
+                                                           stop_early=stop_early, checkpoint=checkpoint,
+                                                           with_summary=True)
+    else:
+        results, summary = _worker_attacker.attack(text, check_caesar, deadline=deadline, stop_early=stop_early,
+                                                   checkpoint=checkpoint, key_range=key_range, with_summary=True)
+    return (results[:top_n], summary) if with_summary else results[:top_n]
+
+def _finish(events, progress=None, with_summary=False):
+    """Drains attack events, relaying progress. Returns the results, or (results, summary)."""
+    for event in events:
+        if event["event"] == "progress" and progress:
+            progress(event["done"], event["total"], event["top"])
+        elif event["event"] == "done":
+            if not with_summary:
+                return event["results"]
+            return event["results"], {k: event[k] for k in ("complete", "stopped_early", "skipped")}
+
+def checkpoint_path(directory, text, check_caesar=False, key_range=None, keywords=False):
+    """Checkpoint file for one search: named after the ciphertext digest and the search options."""
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+    suffix = ('-keywords' if keywords else '') + ('-caesar' if check_caesar else '') \
+        + (f'-{key_range[0]}-{key_range[1]}' if key_range else '')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"transposition-{digest}{suffix}.json")
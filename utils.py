@@ -1,3 +1,6 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 def print_separator():
     print("-" * 60)
 
@@ -30,3 +33,27 @@ def print_results(results):
             r = results[i]
             preview = r['plaintext'][:30].replace('\n', ' ')
             print(f"#{i+1} ({r['score']*100:.1f}%) {preview}...")
+
+
+def ordered_pool_map(func, arg_iter, workers, initializer=None):
+    """
+    Applies func(*args) to each item of arg_iter on a process pool and yields
+    results in input order. At most 2 * workers tasks are in flight, so the
+    input iterator is consumed lazily and memory stays bounded.
+    initializer runs once per worker process (e.g. to build an attacker).
+    """
+    if workers <= 1:
+        if initializer:
+            initializer()
+        for args in arg_iter:
+            yield func(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+        pending = deque()
+        for args in arg_iter:
+            pending.append(pool.submit(func, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -42,7 +42,7 @@ def test_rsa():
     print("\n--- Testing RSA Cipher ---")
     r = RSACipher()
     # Use small keys for speed in testing
-    pub, priv = r.generate_keys(min_val=10, max_val=50)
+    pub, priv = r.generate_keys(keysize=32)
     print(f"Public: {pub}, Private: {priv}")
     
     msg = "HI"
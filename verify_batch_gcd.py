@@ -0,0 +1,44 @@
+"""
+Checks the batch GCD scan: keys that share a prime are broken, and empty or
+comment-only key files scan cleanly instead of crashing.
+Run: python verify_batch_gcd.py
+"""
+import os
+import tempfile
+
+from rsa_cipher import BatchGCDAttacker
+
+def _scan(attacker, text):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keys.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return attacker.scan_file(path)
+
+def test_shared_prime():
+    print("\n--- Testing shared prime detection ---")
+    attacker = BatchGCDAttacker(chunk_size=2)
+    p, q, r, s, t = 1000003, 1000033, 1000037, 1000039, 1000081
+    keys = f"{p * q}\n{r * s}\n# comment\n\n65537 {p * t}\n"
+    broken = _scan(attacker, keys)
+    print(f"Broken keys: {sorted(b['index'] for b in broken)}")
+    assert sorted(b['index'] for b in broken) == [0, 2]
+    assert all(p in (b['details']['p'], b['details']['q']) for b in broken)
+    print("OK")
+
+def test_empty_file():
+    print("\n--- Testing empty and comment-only key files ---")
+    attacker = BatchGCDAttacker()
+    assert attacker.batch_gcd([]) == []
+    assert _scan(attacker, "") == []
+    assert _scan(attacker, "# no keys here\n\n") == []
+    print("OK")
+
+if __name__ == "__main__":
+    try:
+        test_shared_prime()
+        test_empty_file()
+        print("\n[SUCCESS] All tests passed!")
+    except AssertionError as e:
+        print("\n[FAILURE] Assertion failed.")
+        raise e
@@ -0,0 +1,70 @@
+"""
+Checks that an interrupted transposition attack resumed from its checkpoint
+ranks the same candidates as an uninterrupted run. The run is cut partway
+through the first key length, exactly at its end and partway through the
+next one.
+Run: python verify_checkpoint.py
+"""
+import contextlib
+import io
+import itertools
+import math
+import os
+import tempfile
+
+from transposition_cipher import TranspositionCipher, TranspositionAttacker, permutation_rank, permutation_unrank
+
+def _top(results, n=20):
+    return [(round(r['score'], 9), r['plaintext']) for r in results[:n]]
+
+def _run(attacker, ciphertext, checkpoint=None, stop_after=None):
+    """Runs attack_iter(). With stop_after, abandons it after that many checks (like a killed worker)."""
+    events = attacker.attack_iter(ciphertext, tick=1, checkpoint=checkpoint)
+    for event in events:
+        if stop_after is not None and event["event"] == "progress" and event["done"] >= stop_after:
+            events.close()
+            return None
+        if event["event"] == "done":
+            return event["results"]
+
+def test_rank_unrank():
+    print("\n--- Testing permutation rank/unrank ---")
+    for k in range(1, 7):
+        for rank, perm in enumerate(itertools.permutations(range(k))):
+            assert permutation_rank(perm) == rank
+            assert permutation_unrank(k, rank) == perm
+    print("OK")
+
+def test_resume():
+    print("\n--- Testing checkpoint resume ---")
+    attacker = TranspositionAttacker()
+    attacker.MAX_KEY_LEN_BRUTE = 6 # 872 column orders: quick, but still several key lengths
+    attacker.CHECKPOINT_SECONDS = 0 # Save after every candidate
+    ciphertext = TranspositionCipher().encrypt("meetmeatthewarehouse", [2, 0, 3, 1])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = _top(_run(attacker, ciphertext))
+        widths = [k for k, _ in attacker.estimate_key_lengths(ciphertext)]
+    first = math.factorial(widths[0])
+    cuts = [first // 2, first, first + math.factorial(widths[1]) // 2]
+
+    for cut in cuts:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, "checkpoint.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert _run(attacker, ciphertext, checkpoint, stop_after=cut) is None
+                resumed = _top(_run(attacker, ciphertext, checkpoint))
+                finished = _top(_run(attacker, ciphertext, checkpoint)) # Resume of a finished search
+            print(f"Cut after {cut} checks: resumed ranking matches: {resumed == expected}")
+            assert resumed == expected
+            assert finished == expected
+    print("OK")
+
+if __name__ == "__main__":
+    try:
+        test_rank_unrank()
+        test_resume()
+        print("\n[SUCCESS] All tests passed!")
+    except AssertionError as e:
+        print("\n[FAILURE] Assertion failed.")
+        raise e
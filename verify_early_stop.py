@@ -0,0 +1,38 @@
+"""
+Checks the confidence label of a transposition attack that stops early: the
+margin over the runner-up was only checked against the keys searched, so the
+top result must not be reported as a verified match.
+Run: python verify_early_stop.py
+"""
+import contextlib
+import io
+
+from transposition_cipher import TranspositionCipher, TranspositionAttacker
+
+def test_early_stop_label():
+    print("\n--- Testing confidence label after an early stop ---")
+    attacker = TranspositionAttacker()
+    attacker.MAX_KEY_LEN_BRUTE = 6
+    attacker.CONFIDENT_GAP = 0.0 # Any lead counts, so the search stops after the first key length
+    msg = "meetmeatthewarehouseafterthemeetingtonight"
+    ciphertext = TranspositionCipher().encrypt(msg, [2, 0, 1])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stopped, summary = attacker.attack(ciphertext, stop_early=True, with_summary=True)
+        full, full_summary = attacker.attack(ciphertext, with_summary=True)
+    print(f"Stopped early: {summary['stopped_early']} ({summary['skipped']:.1%} skipped), "
+          f"label: {stopped[0]['confidence']}")
+    print(f"Full search label: {full[0]['confidence']}")
+    assert summary['stopped_early'] and stopped[0]['plaintext'] == msg
+    assert stopped[0]['confidence'] == "HIGH (UNVERIFIED - PARTIAL SEARCH)"
+    assert not full_summary['stopped_early']
+    assert full[0]['confidence'] == "HIGH (MATCH FOUND)"
+    print("OK")
+
+if __name__ == "__main__":
+    try:
+        test_early_stop_label()
+        print("\n[SUCCESS] All tests passed!")
+    except AssertionError as e:
+        print("\n[FAILURE] Assertion failed.")
+        raise e
@@ -20,7 +20,7 @@ def test_rsa_details():
     attacker = RSAAttacker()
     
     # Generate small keys for fast testing
-    pub, priv = rsa.generate_keys(min_val=50, max_val=200)
+    pub, priv = rsa.generate_keys(keysize=32)
     e, n = pub
     print(f"Public Key: {pub}")
     